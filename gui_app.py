@@ -211,14 +211,10 @@ class ProcessThread(QThread):
         """
         df = df.copy()
 
-        df['category'] = df['merchant'].map(lambda m: cat_mgr.category_map.get(m, [None, None])[0])
-        df['subcat'] = df['merchant'].map(lambda m: cat_mgr.category_map.get(m, [None, None])[1])
+        df['category'], df['subcat'] = cat_mgr.lookup_mappings(df['merchant'])
 
-        flat_choices = [
-            (cat, sub)
-            for cat, subs in cat_mgr.valid_categories.items()
-            for sub in subs
-        ]
+        # category_needed is declared with a list payload
+        flat_choices = list(cat_mgr.flat_choices)
         valid_pairs = set(flat_choices)
 
         # Detect merchants mapped to categories that no longer exist in the template
@@ -249,6 +245,8 @@ class ProcessThread(QThread):
         ]
 
         total_unknown = len(unknown)
+        # First row of each unknown merchant, found in one pass rather than a mask per merchant
+        sample_rows = df[df['merchant'].isin(unknown)].drop_duplicates('merchant').set_index('merchant', drop=False)
         for idx, merchant in enumerate(unknown, start=1):
             if self._should_stop:
                 return df
@@ -256,10 +254,9 @@ class ProcessThread(QThread):
             self.log_message.emit('INFO', f'Unknown merchant: {merchant}')
 
             # Get sample transaction data for this merchant
-            merchant_rows = df[df['merchant'] == merchant]
             sample_data = {}
-            if not merchant_rows.empty:
-                sample_row = merchant_rows.iloc[0]
+            if merchant in sample_rows.index:
+                sample_row = sample_rows.loc[merchant]
                 if 'amount' in sample_row:
                     sample_data['amount'] = float(sample_row['amount'])
                 if 'transaction_date' in sample_row and pd.notna(sample_row['transaction_date']):
@@ -1307,11 +1304,7 @@ class CategoryManagementDialog(QDialog):
         # current_cat = self.category_manager.category_map.get(merchant, [None, None])
 
         # Get all valid category choices
-        flat_choices = [
-            (cat, sub)
-            for cat, subs in self.category_manager.valid_categories.items()
-            for sub in subs
-        ]
+        flat_choices = list(self.category_manager.flat_choices)
 
         dialog = CategoryDialog(merchant, flat_choices, self.translations, self)
         if dialog.exec() == QDialog.DialogCode.Accepted and dialog.selected_category:
@@ -2662,23 +2655,24 @@ class BudgetTrackerGUI(QMainWindow):
             QColor(230, 255, 255),  # Light cyan
         ]
 
-        for row_idx, (index, row) in enumerate(category_summary.iterrows()):
+        summary_rows = category_summary[['category', 'monthly_amount']].itertuples(index=False, name=None)
+        for row_idx, (category, monthly_amount) in enumerate(summary_rows):
             cat_color = category_colors[row_idx % len(category_colors)]
 
             # Category
-            cat_item = QTableWidgetItem(str(row['category']))
+            cat_item = QTableWidgetItem(str(category))
             cat_item.setFont(QFont('Arial', 10))
             cat_item.setBackground(cat_color)
             self.preview_table.setItem(row_idx, 0, cat_item)
 
             # Amount
-            amount_item = QTableWidgetItem(f"₪{row['monthly_amount']:,.2f}")
+            amount_item = QTableWidgetItem(f"₪{monthly_amount:,.2f}")
             amount_item.setFont(QFont('Arial', 10))
             amount_item.setBackground(cat_color)
             self.preview_table.setItem(row_idx, 1, amount_item)
 
             # Percentage
-            pct = (row['monthly_amount'] / grand_total * 100) if grand_total > 0 else 0
+            pct = (monthly_amount / grand_total * 100) if grand_total > 0 else 0
             pct_item = QTableWidgetItem(f"{pct:.1f}%")
             pct_item.setFont(QFont('Arial', 10))
             pct_item.setBackground(cat_color)
@@ -3,7 +3,11 @@ import sys
 import logging
 import re
 import pkgutil
-from typing import List, Tuple, Dict, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from types import MappingProxyType
+from typing import List, Tuple, Dict, Mapping, Optional
 from dataclasses import dataclass, field
 import pandas as pd
 from pathlib import Path
@@ -12,6 +16,11 @@ from openpyxl.cell import Cell
 from src.previewer import format_prompt
 from src.config import TEMPLATE_SHEET_NAME, MAX_CATEGORIES
 
+try:
+    import orjson  # Optional C-accelerated JSON parser
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # Template validation constants
@@ -21,6 +30,11 @@ HEADER_PATTERNS = {
     'category': ['נושא', 'נושא הוצאה', 'category', 'קטגוריה'],
     'subcategory': ['פירוט', 'פירוט הוצאות', 'subcategory', 'תת-קטגוריה'],
 }
+# Lowercased once for is_header_value
+_HEADER_PATTERNS_LOWER = {
+    header_type: tuple(pattern.lower() for pattern in patterns)
+    for header_type, patterns in HEADER_PATTERNS.items()
+}
 
 
 @dataclass
@@ -50,17 +64,17 @@ def safe_get_cell_value(cell: Cell) -> Optional[str]:
     Returns:
         Cleaned string value or None if cell is empty/invalid
     """
+    # Handle Excel errors (e.g., #REF!, #VALUE!); openpyxl flags them with data type 'e'
+    if cell.data_type == 'e':
+        logger.warning(f"Excel error in cell {cell.coordinate}: {cell.value}")
+        return None
+
     val = cell.value
 
     # Handle None
     if val is None:
         return None
 
-    # Handle Excel errors (e.g., #REF!, #VALUE!)
-    if isinstance(val, str) and val.startswith('#'):
-        logger.warning(f"Excel error in cell {cell.coordinate}: {val}")
-        return None
-
     # Convert to string and strip whitespace
     val_str = str(val).strip()
 
@@ -71,6 +85,20 @@ def safe_get_cell_value(cell: Cell) -> Optional[str]:
     return val_str
 
 
+def _json_loads(data: bytes):
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize to indented UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
 def normalize_category_name(name: Optional[str]) -> Optional[str]:
     """
     Normalize category name for consistent matching.
@@ -91,10 +119,27 @@ def normalize_category_name(name: Optional[str]) -> Optional[str]:
     if not name:
         return None
 
-    # Collapse multiple spaces
-    name = ' '.join(name.split())
+    # Collapse multiple spaces. Already-clean names (the common case) skip the
+    # split/join: every whitespace char other than ' ' is non-printable, so a
+    # printable name without double spaces is unchanged by it.
+    if '  ' in name or not name.isprintable():
+        name = ' '.join(name.split())
+
+    # Intern so repeated names share one object and compare by identity first
+    return sys.intern(name)
+
 
-    return name
+def _intern_mapping(mapping: List) -> List:
+    """Intern the string entries of a [category, subcategory] mapping."""
+    return [sys.intern(v) if isinstance(v, str) else v for v in mapping]
+
+
+def _clean_default_map(default_map: Dict) -> Dict[str, List[str]]:
+    """Intern default mappings, blanking entries that aren't [category, subcategory] lists."""
+    return {
+        sys.intern(merchant): _intern_mapping(mapping) if isinstance(mapping, list) and len(mapping) >= 2 else []
+        for merchant, mapping in default_map.items()
+    }
 
 
 def is_header_value(value: Optional[str], header_type: str) -> bool:
@@ -112,14 +157,14 @@ def is_header_value(value: Optional[str], header_type: str) -> bool:
         return False
 
     value_lower = value.lower().strip()
-    patterns = HEADER_PATTERNS.get(header_type, [])
+    patterns = _HEADER_PATTERNS_LOWER.get(header_type, ())
 
-    return any(pattern.lower() in value_lower for pattern in patterns)
+    return any(pattern in value_lower for pattern in patterns)
 
 
 class CategoryManager:
     # Class-level cache for template structure
-    _template_cache: Optional[Dict[str, List[str]]] = None
+    _template_cache: Optional[Mapping[str, Tuple[str, ...]]] = None
     _cache_timestamp: Optional[float] = None
     _cache_dashboard_path: Optional[Path] = None
 
@@ -130,8 +175,35 @@ class CategoryManager:
         # Merchants explicitly confirmed by user (loaded from categories.json or set in GUI flow)
         self._explicit_user_merchants = set()
 
-        self.category_map = self._load_category_map()
-        self.valid_categories = self.load_category_structure_from_template(strict=strict_validation, use_cache=True)
+        # The JSON mappings and the Template sheet are independent; load them
+        # concurrently so the smaller JSON read hides behind the workbook parse.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            map_future = pool.submit(self._load_category_map)
+            template_future = pool.submit(
+                self.load_category_structure_from_template, strict=strict_validation, use_cache=True
+            )
+            self.category_map = map_future.result()
+            self.valid_categories = template_future.result()
+
+    @property
+    def valid_categories(self) -> Mapping[str, Tuple[str, ...]]:
+        """Category structure loaded from the Template sheet."""
+        return self._valid_categories
+
+    @valid_categories.setter
+    def valid_categories(self, value: Mapping[str, Tuple[str, ...]]) -> None:
+        self._valid_categories = value
+        # Drop choices derived from the previous structure
+        self.__dict__.pop('flat_choices', None)
+
+    @cached_property
+    def flat_choices(self) -> Tuple[Tuple[str, str], ...]:
+        """All (category, subcategory) pairs in template order."""
+        return tuple(
+            (cat, sub)
+            for cat, subs in self.valid_categories.items()
+            for sub in subs
+        )
 
     def _load_category_map(self) -> Dict[str, List[str]]:
         """
@@ -165,13 +237,10 @@ class CategoryManager:
             # Try loading as package resource (works in compiled exe)
             data = pkgutil.get_data('src', 'default_categories.json')
             if data:
-                default_map = json.loads(data.decode('utf-8'))
+                default_map = _json_loads(data)
                 logger.debug(f"Loaded {len(default_map)} default categories from package resource")
                 # Ensure all entries are properly formatted [category, subcategory]
-                return {
-                    merchant: mapping if isinstance(mapping, list) and len(mapping) >= 2 else []
-                    for merchant, mapping in default_map.items()
-                }
+                return _clean_default_map(default_map)
         except Exception as e:
             logger.debug(f"Could not load from package resource: {e}")
         
@@ -185,13 +254,9 @@ class CategoryManager:
             
             for default_file in possible_paths:
                 if default_file.exists():
-                    with open(default_file, 'r', encoding='utf-8') as f:
-                        default_map = json.load(f)
-                        logger.debug(f"Loaded {len(default_map)} default categories from {default_file}")
-                        return {
-                            merchant: mapping if isinstance(mapping, list) and len(mapping) >= 2 else []
-                            for merchant, mapping in default_map.items()
-                        }
+                    default_map = _json_loads(default_file.read_bytes())
+                    logger.debug(f"Loaded {len(default_map)} default categories from {default_file}")
+                    return _clean_default_map(default_map)
         except Exception as e2:
             logger.warning(f"Could not load default categories from file: {e2}")
         
@@ -206,15 +271,14 @@ class CategoryManager:
             Dictionary of user mappings
         """
         try:
-            with open(self.categories_path, 'r', encoding='utf-8') as f:
-                user_map = json.load(f)
-                # Clean up: remove _default flag if present and ensure proper format
-                cleaned_map = {}
-                for merchant, mapping in user_map.items():
-                    if isinstance(mapping, list) and len(mapping) >= 2:
-                        # Keep only [category, subcategory], strip _default flag
-                        cleaned_map[merchant] = mapping[:2]
-                return cleaned_map
+            user_map = _json_loads(Path(self.categories_path).read_bytes())
+            # Clean up: remove _default flag if present and ensure proper format
+            cleaned_map = {}
+            for merchant, mapping in user_map.items():
+                if isinstance(mapping, list) and len(mapping) >= 2:
+                    # Keep only [category, subcategory], strip _default flag
+                    cleaned_map[sys.intern(merchant)] = _intern_mapping(mapping[:2])
+            return cleaned_map
         except (FileNotFoundError, json.JSONDecodeError):
             logger.warning(f"User categories file not found or invalid: {self.categories_path}. Starting with empty map.")
             return {}
@@ -233,7 +297,8 @@ class CategoryManager:
             result.add_error(f"Dashboard file not found: {self.dashboard_path}")
             return result
 
-        wb = load_workbook(self.dashboard_path, data_only=True)
+        # Read-only mode streams the sheet XML instead of building the full cell model
+        wb = load_workbook(self.dashboard_path, read_only=True, data_only=True)
         try:
             # Check if Template sheet exists
             if TEMPLATE_SHEET_NAME not in wb.sheetnames:
@@ -244,6 +309,8 @@ class CategoryManager:
                 return result
 
             ws = wb[TEMPLATE_SHEET_NAME]
+            # Don't trust the stored <dimension>; scan until the last row
+            ws.reset_dimensions()
 
             # Track for duplicate detection
             seen_categories = set()
@@ -274,6 +341,10 @@ class CategoryManager:
                             result.add_error(
                                 f"Duplicate category '{cat_normalized}' found at row {row_num + 1}"
                             )
+                        elif len(seen_categories) >= MAX_CATEGORIES:
+                            # Stop scanning before registering the category that exceeds the limit
+                            result.add_error(f"Too many categories. Maximum allowed: {MAX_CATEGORIES}")
+                            break
                         else:
                             seen_categories.add(cat_normalized)
                             category_subcats[cat_normalized] = set()
@@ -320,12 +391,6 @@ class CategoryManager:
 
             # Validation checks after loading
 
-            # Check total category count
-            if len(seen_categories) > MAX_CATEGORIES:
-                result.add_error(
-                    f"Too many categories ({len(seen_categories)}). Maximum allowed: {MAX_CATEGORIES}"
-                )
-
             # Check for empty categories (no subcategories)
             for cat, subcats in category_subcats.items():
                 if len(subcats) == 0:
@@ -357,7 +422,8 @@ class CategoryManager:
 
         return result
 
-    def load_category_structure_from_template(self, strict: bool = True, use_cache: bool = True) -> Dict[str, List[str]]:
+    def load_category_structure_from_template(self, strict: bool = True,
+                                              use_cache: bool = True) -> Mapping[str, Tuple[str, ...]]:
         """
         Loads the category structure from the 'Template' sheet in the given Excel dashboard.
         Skips header rows and supports merged cells in the first column for categories.
@@ -369,7 +435,8 @@ class CategoryManager:
             use_cache: If True, use cached template structure if available and valid.
 
         Returns:
-            Dictionary mapping category names to lists of subcategory names
+            Read-only mapping of category names to tuples of subcategory names.
+            Callers that need to mutate it should copy it with dict().
         """
         dashboard_path = Path(self.dashboard_path)
 
@@ -381,7 +448,7 @@ class CategoryManager:
                     current_mtime = dashboard_path.stat().st_mtime
                     if self._cache_timestamp is not None and current_mtime <= self._cache_timestamp:
                         logger.debug("Using cached template structure")
-                        return self._template_cache.copy()  # Return a copy to prevent mutation
+                        return self._template_cache  # Read-only, safe to share
                 except (OSError, FileNotFoundError):
                     # File doesn't exist or can't be accessed, invalidate cache
                     self._invalidate_cache()
@@ -409,11 +476,12 @@ class CategoryManager:
             )
             raise ValueError(error_msg)
 
-        # Load categories with improved robustness
-        wb = load_workbook(self.dashboard_path, data_only=True)
+        # Load categories with improved robustness (streamed, read-only)
+        wb = load_workbook(self.dashboard_path, read_only=True, data_only=True)
         try:
             try:
                 ws = wb[TEMPLATE_SHEET_NAME]
+                ws.reset_dimensions()
             except KeyError:
                 logger.error("The worksheet 'Template' does not exist in the dashboard file.")
                 available_sheets = ', '.join(wb.sheetnames) if wb.sheetnames else 'None'
@@ -428,7 +496,9 @@ class CategoryManager:
                     f"  4. Save the file and try again"
                 )
 
-            categories = {}
+            categories: Dict[str, List[str]] = {}
+            # Per-category membership sets keep subcategory dedupe O(1)
+            seen: Dict[str, set] = defaultdict(set)
             current_category = None
 
             for row in ws.iter_rows(min_row=2, max_col=2):  # skip row 1 (headers)
@@ -447,8 +517,7 @@ class CategoryManager:
                     cat_normalized = normalize_category_name(cat_val)
                     if cat_normalized:
                         current_category = cat_normalized
-                        if current_category not in categories:
-                            categories[current_category] = []
+                        categories.setdefault(current_category, [])
 
                 # Add subcategory with normalization
                 if subcat_val and current_category:
@@ -456,7 +525,9 @@ class CategoryManager:
                     if subcat_normalized:
                         # Note: duplicates within same category are already caught by validation
                         # but we won't add them again here
-                        if subcat_normalized not in categories[current_category]:
+                        subcats_seen = seen[current_category]
+                        if subcat_normalized not in subcats_seen:
+                            subcats_seen.add(subcat_normalized)
                             categories[current_category].append(subcat_normalized)
 
             logger.info("=== Current category structure from Template ===")
@@ -464,10 +535,13 @@ class CategoryManager:
                 logger.info(f"{category}: {subcategories}")
             logger.info("===============================================")
 
+            # Freeze so the structure can be shared from the cache without copying
+            frozen = MappingProxyType({cat: tuple(subs) for cat, subs in categories.items()})
+
             # Update cache
             if use_cache:
                 try:
-                    self._template_cache = categories.copy()
+                    self._template_cache = frozen
                     self._cache_timestamp = dashboard_path.stat().st_mtime
                     self._cache_dashboard_path = dashboard_path
                     logger.debug("Template structure cached")
@@ -475,7 +549,7 @@ class CategoryManager:
                     # If we can't get mtime, don't cache
                     pass
 
-            return categories
+            return frozen
         finally:
             wb.close()
 
@@ -492,44 +566,60 @@ class CategoryManager:
         logger.debug("Template cache invalidated")
 
     @classmethod
-    def get_cached_categories(cls) -> Optional[Dict[str, List[str]]]:
+    def get_cached_categories(cls) -> Optional[Mapping[str, Tuple[str, ...]]]:
         """
         Get cached category structure without loading from file.
 
         Returns:
             Cached category structure or None if cache is invalid/empty
         """
-        if cls._template_cache is not None:
-            return cls._template_cache.copy()
-        return None
+        return cls._template_cache
 
+    def lookup_mappings(self, merchants: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        """
+        Look up the mapped category and subcategory for a column of merchants.
 
+        Each distinct merchant is looked up once and the results are spread back by code,
+        instead of calling into category_map for every row.
+
+        Args:
+            merchants: Merchant names
+
+        Returns:
+            Tuple of (category, subcategory) Series aligned with merchants; None when unmapped
+        """
+        codes, uniques = pd.factorize(merchants, use_na_sentinel=False)
+        pairs = [self.category_map.get(m, [None, None]) for m in uniques]
+        categories = pd.Series([pair[0] for pair in pairs]).take(codes).set_axis(merchants.index)
+        subcats = pd.Series([pair[1] for pair in pairs]).take(codes).set_axis(merchants.index)
+        return categories, subcats
 
     def map_categories(self, df: pd.DataFrame) -> pd.DataFrame:
         df = df.copy()
 
-        df['category'] = df['merchant'].map(lambda m: self.category_map.get(m, [None, None])[0])
-        df['subcat']   = df['merchant'].map(lambda m: self.category_map.get(m, [None, None])[1])
+        df['category'], df['subcat'] = self.lookup_mappings(df['merchant'])
 
         unknown = [m for m in df['merchant'].unique() if m and m not in self.category_map]
-        flat_choices: List[Tuple[str, str]] = [
-            (cat, sub)
-            for cat, subs in self.valid_categories.items()
-            for sub in subs
-        ]
+        flat_choices = self.flat_choices
+        # Answers collected during the prompt loop, applied to df in one pass afterwards
+        new_mappings: Dict[str, Tuple[str, str]] = {}
 
         try:
+            # The choices don't change between merchants, so show the menu once
+            if unknown:
+                for idx, (cat, sub) in enumerate(flat_choices, start=1):
+                    print(format_prompt(f"{idx}. {cat} > {sub}"))
+
+            # First row of each unknown merchant, found in one pass rather than a mask per merchant
+            sample_rows = df[df['merchant'].isin(unknown)].drop_duplicates('merchant').set_index('merchant', drop=False)
+
             for merchant in unknown:
                 # Show sample rows for that merchant
-                merchant_rows = df[df['merchant'] == merchant]
-                sample_row = merchant_rows.iloc[0] if not merchant_rows.empty else None
+                sample_row = sample_rows.loc[merchant] if merchant in sample_rows.index else None
                 print(format_prompt(f"New merchant detected: {merchant}"))
                 if sample_row is not None:
                     logger.debug(f"New merchant detected: {merchant} [date: {sample_row.get('month')}/{sample_row.get('year')}, file: {sample_row.get('source_file')}]")
 
-                for idx, (cat, sub) in enumerate(flat_choices, start=1):
-                    print(format_prompt(f"{idx}. {cat} > {sub}"))
-
                 while True:
                     choice = input("Select category number (or 'exit'): ").strip().lower()
                     if choice == "exit":
@@ -544,8 +634,7 @@ class CategoryManager:
                         cat, sub = flat_choices[idx - 1]
                         self.category_map[merchant] = [cat, sub]
                         self.mark_user_confirmed(merchant)
-                        df.loc[df['merchant'] == merchant, 'category'] = cat
-                        df.loc[df['merchant'] == merchant, 'subcat'] = sub
+                        new_mappings[merchant] = (cat, sub)
                         break
                     else:
                         print(format_prompt("Choice out of range."))
@@ -555,6 +644,10 @@ class CategoryManager:
         else:
             self.save_categories()
 
+        if new_mappings:
+            df['category'] = df['category'].fillna(df['merchant'].map({m: v[0] for m, v in new_mappings.items()}))
+            df['subcat'] = df['subcat'].fillna(df['merchant'].map({m: v[1] for m, v in new_mappings.items()}))
+
         # Revalidate existing mappings
         df = self._handle_removed_subcategories(df)
 
@@ -563,11 +656,8 @@ class CategoryManager:
 
 
     def _handle_removed_subcategories(self, df: pd.DataFrame) -> pd.DataFrame:
-        valid_subcats = {
-            (cat, sub)
-            for cat, subs in self.valid_categories.items()
-            for sub in subs
-        }
+        flat_choices = self.flat_choices
+        valid_subcats = set(flat_choices)
 
         used_pairs = {
             (cat, sub)
@@ -580,11 +670,6 @@ class CategoryManager:
             return df
 
         print(format_prompt("Some previously used subcategories are no longer in the template."))
-        flat_choices = [
-            (cat, sub)
-            for cat, subs in self.valid_categories.items()
-            for sub in subs
-        ]
         for idx, (cat, sub) in enumerate(flat_choices, start=1):
             print(format_prompt(f"{idx}. {cat} > {sub}"))
 
@@ -736,8 +821,7 @@ class CategoryManager:
                 ):
                     user_only_map[merchant] = clean_mapping
         
-        with open(self.categories_path, 'w', encoding='utf-8') as f:
-            json.dump(user_only_map, f, ensure_ascii=False, indent=2)
+        Path(self.categories_path).write_bytes(_json_dumps(user_only_map))
         
         logger.info(f"Saved {len(user_only_map)} user-specific category mappings")
 
@@ -52,6 +52,9 @@ def get_log_level() -> int:
     """
     Get current log level from config.py.
 
+    The level is held in memory (see set_log_level), so this is cheap
+    to call from hot paths and needs no caching.
+
     Returns:
         Logging level constant (e.g., logging.DEBUG)
     """
@@ -96,6 +99,7 @@ FILE_HEADER_KEYWORDS = {
 
 # Security and Validation Constants
 MAX_FILE_SIZE_MB = 50  # Maximum file size for supported transaction files
+MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
 MAX_CATEGORIES = 10000  # Maximum number of categories to prevent unbounded growth
 MAX_MERCHANT_NAME_LENGTH = 200  # Maximum length for merchant names
 BACKUP_SUFFIX = '.backup'
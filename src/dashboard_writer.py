@@ -1,6 +1,12 @@
+import numpy as np
 import pandas as pd
 import os
 import logging
+import shutil
+import threading
+from copy import copy
+from functools import cache
+from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Tuple, Callable, List
 from openpyxl import load_workbook
@@ -11,11 +17,30 @@ from src.config import TEMPLATE_SHEET_NAME, DASHBOARD_BACKUP_DIR
 
 logger = logging.getLogger(__name__)
 SUMMARY_LABELS = {"Summary", "סיכום"}
+# Shared style objects for written month cells (openpyxl styles are immutable)
+_CENTER_ALIGN = Alignment(horizontal="center", vertical="center")
+_NORMAL_FONT = Font(bold=False)
+
+
+@cache
+def _ensure_backup_dir(backup_dir: Path) -> Path:
+    """
+    Create the backup directory once per process.
+
+    Args:
+        backup_dir: Backup directory path
+
+    Returns:
+        The same directory path
+    """
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    return backup_dir
 
 
 class DashboardWriter:
     def __init__(self, dashboard_path: Path | str) -> None:
         self.dashboard_path = dashboard_path
+        self._dashboard_path = Path(dashboard_path)
         self.template_sheet_name = TEMPLATE_SHEET_NAME
         self.user_decisions = {}
 
@@ -43,70 +68,117 @@ class DashboardWriter:
 
         self.conflict_resolver = conflict_resolver
 
-        years = sorted(summary_df['year'].unique())
-        file_exists = os.path.exists(self.dashboard_path)
-
-        if not file_exists:
+        # One hash-partition pass instead of a boolean mask per year
+        year_frames = dict(list(summary_df.groupby('year', sort=True)))
+        try:
+            dashboard_stat = os.stat(self.dashboard_path)
+        except (FileNotFoundError, NotADirectoryError):
             logger.error(f"Dashboard file not found: {self.dashboard_path}")
             raise FileNotFoundError(f"Dashboard file not found: {self.dashboard_path}")
 
-        # Check if file is locked
+        # Check if file is locked (reusing the stat above)
         from src.file_utils import is_file_locked
-        if is_file_locked(Path(self.dashboard_path)):
+        if is_file_locked(self._dashboard_path, dashboard_stat):
             error_msg = f"Dashboard file is locked (may be open in Excel): {self.dashboard_path}"
             logger.error(error_msg)
             raise PermissionError(error_msg)
 
-        # Create backup before modifying dashboard
-        import shutil
-        from datetime import datetime
+        # Copy the backup in the background while the workbook is parsed;
+        # copyfile releases the GIL during its read/write syscalls.
+        backup = self._start_backup()
+        try:
+            try:
+                wb = load_workbook(self.dashboard_path)
+            except PermissionError as e:
+                logger.error(f"Permission denied opening dashboard: {e}")
+                raise
+            except (IOError, OSError) as e:
+                logger.error(f"IO error opening dashboard: {e}")
+                raise
+            except Exception as e:
+                logger.error(f"Error opening dashboard file: {e}")
+                raise
+
+            try:
+                if self.template_sheet_name not in wb.sheetnames:
+                    logger.error(f"Template sheet '{self.template_sheet_name}' not found in dashboard.")
+                    return
+
+                for year, year_df in year_frames.items():
+                    sheet_name = str(year)
+                    if sheet_name not in wb.sheetnames:
+                        self._clone_template_sheet(wb, sheet_name)
+
+                    ws = wb[sheet_name]
+                    self._populate_sheet(ws, year, year_df)
+
+                # The backup must be complete before the original is overwritten
+                self._finish_backup(backup)
+                backup = None
+                wb.save(self.dashboard_path)
+            finally:
+                wb.close()
+        finally:
+            if backup is not None:
+                self._finish_backup(backup)
+
+    def _start_backup(self) -> Optional[Tuple[threading.Thread, Path, List[BaseException]]]:
+        """
+        Start copying the dashboard to the backup directory on a background thread.
 
+        Returns:
+            Tuple of (thread, backup_path, captured_errors), or None if the backup could not be started
+        """
         try:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            # Ensure backup directory exists
-            os.makedirs(DASHBOARD_BACKUP_DIR, exist_ok=True)
+            backup_dir = _ensure_backup_dir(DASHBOARD_BACKUP_DIR)
 
-            stem = Path(self.dashboard_path).stem
-            suffix = Path(self.dashboard_path).suffix
+            stem = self._dashboard_path.stem
+            suffix = self._dashboard_path.suffix
             backup_filename = f"{stem}_{timestamp}{suffix}"
-            backup_path = DASHBOARD_BACKUP_DIR / backup_filename
-
-            shutil.copy2(self.dashboard_path, backup_path)
-            logger.info(f"Created backup: {backup_path}")
+            backup_path = backup_dir / backup_filename
         except (IOError, OSError, PermissionError) as e:
             logger.warning(f"Failed to create backup: {e}")
             # Continue even if backup fails, but log the warning
-        except Exception as e:
-            logger.warning(f"Unexpected error creating backup: {e}")
-
-        try:
-            wb = load_workbook(self.dashboard_path)
-        except PermissionError as e:
-            logger.error(f"Permission denied opening dashboard: {e}")
-            raise
-        except (IOError, OSError) as e:
-            logger.error(f"IO error opening dashboard: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Error opening dashboard file: {e}")
-            raise
+            return None
+
+        errors: List[BaseException] = []
+
+        def run_copy() -> None:
+            # copyfile uses the platform fast-copy path (sendfile/fcopyfile/CopyFile2)
+            try:
+                try:
+                    shutil.copyfile(self.dashboard_path, backup_path)
+                except FileNotFoundError:
+                    # The backup directory was removed after it was first created
+                    backup_dir.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(self.dashboard_path, backup_path)
+            except BaseException as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=run_copy, name="dashboard-backup", daemon=True)
+        thread.start()
+        return thread, backup_path, errors
+
+    def _finish_backup(self, backup: Optional[Tuple[threading.Thread, Path, List[BaseException]]]) -> None:
+        """
+        Wait for the background backup and copy file metadata as copy2 would.
 
+        Args:
+            backup: Value returned by _start_backup
+        """
+        if backup is None:
+            return
+        thread, backup_path, errors = backup
+        thread.join()
+        if errors:
+            logger.warning(f"Failed to create backup: {errors[0]}")
+            return
         try:
-            if self.template_sheet_name not in wb.sheetnames:
-                logger.error(f"Template sheet '{self.template_sheet_name}' not found in dashboard.")
-                return
-
-            for year in years:
-                sheet_name = str(year)
-                if sheet_name not in wb.sheetnames:
-                    self._clone_template_sheet(wb, sheet_name)
-
-                ws = wb[sheet_name]
-                self._populate_sheet(ws, year, summary_df[summary_df['year'] == year])
-
-            wb.save(self.dashboard_path)
-        finally:
-            wb.close()
+            shutil.copystat(self.dashboard_path, backup_path)
+            logger.info(f"Created backup: {backup_path}")
+        except (IOError, OSError, PermissionError) as e:
+            logger.warning(f"Failed to create backup: {e}")
 
     def _validate_summary(self, df: pd.DataFrame) -> bool:
         required_cols = {'year', 'month', 'category', 'subcat', 'monthly_amount'}
@@ -144,20 +216,22 @@ class DashboardWriter:
         if not pd.api.types.is_numeric_dtype(summary_df['monthly_amount']):
             errors.append("Monthly amount column must be numeric")
 
-        # Validate year range
+        # Validate year range (reductions on the raw arrays; no filtered frames are built)
         current_year = datetime.now().year
-        if summary_df['year'].min() < 2000 or summary_df['year'].max() > current_year + 1:
+        years = summary_df['year'].to_numpy()
+        if years.min() < 2000 or years.max() > current_year + 1:
             errors.append(f"Year values must be between 2000 and {current_year + 1}")
 
         # Validate month range
-        invalid_months = summary_df[(summary_df['month'] < 1) | (summary_df['month'] > 12)]
-        if not invalid_months.empty:
-            errors.append(f"Invalid month values found: {invalid_months['month'].unique().tolist()}")
+        months = summary_df['month'].to_numpy()
+        bad_months = (months < 1) | (months > 12)
+        if bad_months.any():
+            errors.append(f"Invalid month values found: {np.unique(months[bad_months]).tolist()}")
 
         # Warn about negative amounts (e.g. refunds) but don't fail validation
-        negative_amounts = summary_df[summary_df['monthly_amount'] < 0]
-        if not negative_amounts.empty:
-            logger.warning(f"Found {len(negative_amounts)} transaction(s) with negative amounts (possibly refunds)")
+        negative_count = int((summary_df['monthly_amount'].to_numpy() < 0).sum())
+        if negative_count:
+            logger.warning(f"Found {negative_count} transaction(s) with negative amounts (possibly refunds)")
 
         is_valid = len(errors) == 0
         return is_valid, errors
@@ -170,36 +244,46 @@ class DashboardWriter:
         logger.info(f"Created new sheet by cloning template: {new_sheet_name}")
 
     def _populate_sheet(self, ws: Worksheet, year: int, df: pd.DataFrame) -> None:
-        # Map month numbers to column indexes (e.g., Jan -> col 3)
-        month_columns = {str(m): 2 + (m - 1) for m in range(1, 13)}
+        # Pull the needed columns out once instead of building a Series per row
+        cats = df['category'].to_numpy()
+        subcats = df['subcat'].to_numpy()
+        months = df['month'].to_numpy(dtype='int64')
+        amounts = df['monthly_amount'].to_numpy(dtype='float64')
+        # Month number -> sheet column (Jan -> column C)
+        month_cols = months + 2
 
         # Build mapping of existing subcategories to rows
         category_ranges = self._get_category_row_ranges(ws)
         existing_map = self._build_subcat_location_map(ws, category_ranges)
 
-        for _, row in df.iterrows():
-            cat = row['category']
-            subcat = row['subcat']
-            month = str(int(row['month']))
-            amount = row['monthly_amount']
-            col = month_columns[month]
+        for i in range(len(df)):
+            cat = cats[i]
+            subcat = subcats[i]
+            month = int(months[i])
+            amount = float(amounts[i])
+            column = int(month_cols[i])
 
+            # Both helpers keep category_ranges/existing_map in sync, so the sheet
+            # is never rescanned inside this loop.
             if cat not in category_ranges:
                 logger.info(f"New category detected: {cat}. Adding it.")
-                self._add_new_category(ws, cat)
-                category_ranges = self._get_category_row_ranges(ws)
+                new_row = self._add_new_category(ws, cat)
+                category_ranges[cat] = (new_row, new_row)
 
             if (cat, subcat) not in existing_map:
                 logger.info(f"New subcategory '{subcat}' under '{cat}' detected. Adding it.")
                 self._add_new_subcategory(ws, cat, subcat, existing_map, category_ranges)
-                existing_map = self._build_subcat_location_map(ws, category_ranges)
 
             row_idx = existing_map[(cat, subcat)]
-            self._ensure_writable_month_cell(ws, row_idx, col + 1)
-            cell = ws.cell(row=row_idx, column=col + 1)
-            existing_value = cell.value
+            self._ensure_writable_month_cell(ws, row_idx, column)
+            cell = ws.cell(row=row_idx, column=column)
+            # Raw stored value; the common case is an empty cell
+            existing_value = cell._value
 
-            if existing_value is not None and existing_value != 0 and existing_value != "":
+            if existing_value is None or existing_value == 0 or existing_value == "":
+                logger.debug(f"Writing to new cell {cell.coordinate}: {amount}")
+                cell.value = amount
+            else:
                 month_key = f"{year}-{month}"
                 if month_key not in self.user_decisions:
                     decision = self._prompt_user_decision(month_key, self.conflict_resolver)
@@ -212,7 +296,9 @@ class DashboardWriter:
                     cell.value = amount
                 elif decision == "add":
                     try:
-                        new_val = float(existing_value) + amount
+                        if not isinstance(existing_value, (int, float)):
+                            existing_value = float(existing_value)
+                        new_val = existing_value + amount
                         logger.debug(f"Adding to cell {cell.coordinate}: {existing_value} + {amount} = {new_val}")
                         cell.value = new_val
                     except Exception:
@@ -220,12 +306,12 @@ class DashboardWriter:
                 elif decision == "skip":
                     logger.debug(f"Skipping cell {cell.coordinate}")
                     continue
-            else:
-                logger.debug(f"Writing to new cell {cell.coordinate}: {amount}")
-                cell.value = amount
 
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.font = Font(bold=False)
+            # Only touch the style array when the cell is not already formatted
+            if cell.alignment != _CENTER_ALIGN:
+                cell.alignment = _CENTER_ALIGN
+            if cell.font != _NORMAL_FONT:
+                cell.font = _NORMAL_FONT
 
         logger.info(f"Dashboard sheet populated for year {year}")
 
@@ -250,8 +336,9 @@ class DashboardWriter:
         summary_row = self._find_summary_row(ws)
         last_data_row = (summary_row - 1) if summary_row else ws.max_row
 
-        for idx in range(2, last_data_row + 1):
-            cat_value = ws.cell(row=idx, column=1).value
+        # Column A only, as plain values
+        rows = ws.iter_rows(min_row=2, max_row=last_data_row, min_col=1, max_col=1, values_only=True)
+        for idx, (cat_value,) in enumerate(rows, start=2):
             if cat_value:
                 if current_cat and start is not None:
                     ranges[current_cat] = (start, idx - 1)
@@ -266,9 +353,8 @@ class DashboardWriter:
         # Returns a map: (category, subcategory) -> row index
         mapping = {}
         for cat, (start, end) in cat_ranges.items():
-            for r in range(start, end + 1):
-                subcat_cell = ws.cell(row=r, column=2)
-                val = subcat_cell.value
+            rows = ws.iter_rows(min_row=start, max_row=end, min_col=2, max_col=2, values_only=True)
+            for r, (val,) in enumerate(rows, start=start):
                 if isinstance(val, str) and val.strip():
                     clean_subcat = val.strip()
                     mapping[(cat, clean_subcat)] = r
@@ -276,14 +362,19 @@ class DashboardWriter:
         logger.debug(f"Total subcategories mapped: {len(mapping)}")
         return mapping
 
-    def _add_new_category(self, ws: Worksheet, category: str) -> None:
+    def _add_new_category(self, ws: Worksheet, category: str) -> int:
+        """Add a category row and return its row index."""
         # Add new categories before the summary row so formulas continue to include them.
+        # Categories all sit above the summary row, so no existing category row moves.
+        # The inserted/appended row is already empty, so no cells are blanked.
         summary_row = self._find_summary_row(ws)
-        insert_at = summary_row if summary_row else ws.max_row + 1
-        self._insert_rows_preserving_merges(ws, insert_at)
-        ws.cell(row=insert_at, column=1, value=category)
-        for col in range(2, 15):
-            ws.cell(row=insert_at, column=col, value="")
+        if not summary_row:
+            # Nothing below to shift: append at the bottom
+            ws.append([category])
+            return ws.max_row
+        self._insert_rows_preserving_merges(ws, summary_row)
+        ws.cell(row=summary_row, column=1, value=category)
+        return summary_row
 
     def _add_new_subcategory(self, ws: Worksheet, category: str, subcat: str,
                              subcat_map: Dict[Tuple[str, str], int], cat_ranges: Dict[str, Tuple[int, int]]) -> None:
@@ -300,6 +391,15 @@ class DashboardWriter:
         if start < end:
             ws.unmerge_cells(start_row=start, end_row=end, start_column=1, end_column=1)
         ws.merge_cells(start_row=start, end_row=end + 1, start_column=1, end_column=1)
+
+        # Shift every row index at or below the inserted row instead of rescanning the sheet
+        for key, row in subcat_map.items():
+            if row >= insert_at:
+                subcat_map[key] = row + 1
+        subcat_map[(category, subcat)] = insert_at
+        for cat, (cat_start, cat_end) in cat_ranges.items():
+            if cat_start >= insert_at:
+                cat_ranges[cat] = (cat_start + 1, cat_end + 1)
         cat_ranges[category] = (start, end + 1)
 
     def _find_summary_row(self, ws: Worksheet) -> Optional[int]:
@@ -314,8 +414,8 @@ class DashboardWriter:
                 if isinstance(value, str) and value.strip() in SUMMARY_LABELS:
                     return merged_range.min_row
 
-        for row_idx in range(2, ws.max_row + 1):
-            value = ws.cell(row=row_idx, column=1).value
+        rows = ws.iter_rows(min_row=2, min_col=1, max_col=1, values_only=True)
+        for row_idx, (value,) in enumerate(rows, start=2):
             if isinstance(value, str) and value.strip() in SUMMARY_LABELS:
                 return row_idx
 
@@ -7,12 +7,44 @@ import sys
 import platform
 from pathlib import Path
 from datetime import datetime
+from functools import cache
 from typing import Optional, Dict, Any
 import json
 
+try:
+    import orjson  # Optional C-accelerated JSON serializer
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+@cache
+def _get_system_info() -> Dict[str, str]:
+    """
+    Collect system information for error reports.
+
+    Computed on first use rather than at import: platform.architecture()
+    runs the `file` command on Unix and platform.version() may shell out on Windows.
+
+    Returns:
+        Dictionary of platform, version and architecture details
+    """
+    return {
+        'platform': platform.system(),
+        'platform_version': platform.version(),
+        'python_version': sys.version,
+        'architecture': platform.architecture()[0]
+    }
+
+
+def _dump_report(report: Dict[str, Any]) -> bytes:
+    """Serialize an error report to indented UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(report, indent=2, ensure_ascii=False).encode('utf-8')
+
+
 class ErrorReporter:
     """Captures and reports errors with full context."""
 
@@ -39,16 +71,13 @@ class ErrorReporter:
         Returns:
             Error report ID (filename without extension)
         """
-        error_id = datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]
+        # One clock read for both the ID and the timestamp field
+        now = datetime.now()
+        error_id = now.strftime('%Y%m%d_%H%M%S_') + f"{now.microsecond // 1000:03d}"
         report_path = self.error_dir / f"error_{error_id}.json"
 
         # Get system information
-        system_info = {
-            'platform': platform.system(),
-            'platform_version': platform.version(),
-            'python_version': sys.version,
-            'architecture': platform.architecture()[0]
-        }
+        system_info = _get_system_info()
 
         # Get stack trace
         stack_trace = ''.join(traceback.format_exception(exctype, value, tb))
@@ -56,7 +85,7 @@ class ErrorReporter:
         # Build error report
         report = {
             'error_id': error_id,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now.isoformat(),
             'exception_type': exctype.__name__,
             'exception_message': str(value),
             'stack_trace': stack_trace,
@@ -67,8 +96,7 @@ class ErrorReporter:
         # Save report
         try:
             self.error_dir.mkdir(parents=True, exist_ok=True)
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            report_path.write_bytes(_dump_report(report))
             logger.error(f"Error report saved: {report_path}")
         except Exception as e:
             logger.error(f"Failed to save error report: {e}")
@@ -7,10 +7,11 @@ from zipfile import BadZipFile
 from datetime import datetime
 from openpyxl import load_workbook
 import pandas as pd
+from pandas.io.parsers import TextParser
 import logging
 from typing import List, Optional, Dict
 from pypdf import PdfReader
-from src.config import SUPPORTED_EXTENSIONS, ARCHIVE_DIR, TRANSACTIONS_DIR, FILE_HEADER_KEYWORDS, PROCESSED_HASHES_PATH
+from src.config import ARCHIVE_DIR, TRANSACTIONS_DIR, FILE_HEADER_KEYWORDS, PROCESSED_HASHES_PATH
 from src.pdf_statement_rules import (
     MERCHANT_STOP_TOKENS,
     PDF_DETAIL_NOISE_TOKENS,
@@ -19,6 +20,7 @@ from src.pdf_statement_rules import (
     PDF_NOISE_LINE_MARKERS,
     PDF_SECTOR_SUFFIXES,
 )
+from src.validators import validate_transaction_files_in_dir
 
 logger = logging.getLogger(__name__)
 DATE_PATTERN = re.compile(r"\b\d{1,2}[/-]\d{1,2}(?:[/-]\d{2,4})?\b")
@@ -549,12 +551,28 @@ def _load_layout_aware_pdf_transaction_file(file_path: Path) -> Optional[pd.Data
     return df
 
 
+def _frame_from_header_row(raw: pd.DataFrame, header_idx: int) -> pd.DataFrame:
+    """
+    Build the DataFrame read_excel(header=header_idx) would return from an already-read
+    header=None, dtype=object frame.
+
+    The cells are handed back to TextParser, the parser read_excel itself uses, so header
+    de-duplication ('.1', '.2' suffixes), 'Unnamed: i' names and dtype inference match a
+    second read_excel call exactly.
+    """
+    # read_excel passes empty cells to the parser as '' rather than NaN
+    data = raw.where(raw.notna(), '').values.tolist()
+    return TextParser(data, header=header_idx).read()
+
+
 def _load_excel_transaction_file(file_path: Path) -> pd.DataFrame:
-    raw = pd.read_excel(file_path, header=None, engine='openpyxl')
+    # Parse the workbook once; the header row is located in and sliced from the same frame.
+    # dtype=object keeps the cells as read so the header slice can be re-parsed faithfully.
+    raw = pd.read_excel(file_path, header=None, engine='openpyxl', dtype=object)
     header_idx = _detect_header_row(raw)
     if header_idx is None:
         raise _build_invalid_file_error(file_path)
-    df = pd.read_excel(file_path, header=header_idx, engine='openpyxl')
+    df = _frame_from_header_row(raw, header_idx)
     df['source_file'] = file_path.name
     return df
 
@@ -588,11 +606,13 @@ def load_transaction_files(transactions_dir: str | Path) -> List[pd.DataFrame]:
     """
     Load all supported transaction files with a recognizable header row.
     """
-    files = list(Path(transactions_dir).glob('*'))
+    try:
+        files = validate_transaction_files_in_dir(Path(transactions_dir))
+    except (FileNotFoundError, NotADirectoryError):
+        logger.warning(f"Transactions directory not found: {transactions_dir}")
+        return []
     dataframes = []
     for file_path in files:
-        if file_path.suffix.lower() not in SUPPORTED_EXTENSIONS:
-            continue
         df = _load_transaction_file(file_path)
         if df is not None:
             dataframes.append(df)
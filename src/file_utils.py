@@ -2,6 +2,7 @@
 File operation utilities for error handling and validation.
 """
 import os
+import stat
 import logging
 from pathlib import Path
 from typing import Optional
@@ -9,8 +10,11 @@ import platform
 
 logger = logging.getLogger(__name__)
 
+# Resolved once; platform.system() probes the OS on every call
+_IS_WINDOWS = platform.system() == 'Windows'
 
-def is_file_locked(file_path: Path) -> bool:
+
+def is_file_locked(file_path: Path, st: Optional[os.stat_result] = None) -> bool:
     """
     Check if a file is locked/in use (Windows-specific).
 
@@ -19,15 +23,16 @@ def is_file_locked(file_path: Path) -> bool:
 
     Args:
         file_path: Path to the file to check
+        st: Stat result the caller already has for file_path; skips the existence check
 
     Returns:
         True if file appears to be locked, False otherwise
     """
-    if not file_path.exists():
+    if st is None and not file_path.exists():
         return False
 
     try:
-        if platform.system() == 'Windows':
+        if _IS_WINDOWS:
             # On Windows, try to open file in exclusive mode
             try:
                 # Try to open in append mode - if file is locked, this will fail
@@ -58,14 +63,17 @@ def validate_dashboard_integrity(file_path: Path) -> tuple[bool, Optional[str]]:
         Tuple of (is_valid, error_message). is_valid is True if file is valid,
         error_message is None if valid, otherwise contains error description.
     """
-    if not file_path.exists():
+    # One stat answers existence and file type; it is reused by the lock check
+    try:
+        st = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
         return False, f"Dashboard file not found: {file_path}"
 
-    if not file_path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         return False, f"Path is not a file: {file_path}"
 
     # Check if file is locked
-    if is_file_locked(file_path):
+    if is_file_locked(file_path, st):
         return False, f"Dashboard file is locked (may be open in Excel): {file_path}"
 
     # Try to open and validate structure
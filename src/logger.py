@@ -3,13 +3,19 @@ Structured logging with rotation support.
 """
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+from logging.handlers import MemoryHandler, RotatingFileHandler
 from typing import Optional, Any
 from src.config import get_log_level
 
 # Default log rotation settings
 MAX_LOG_SIZE_MB = 10
 BACKUP_COUNT = 5
+# Buffered log writing: records are batched in memory and written through a large file buffer.
+# A batch is written once it is full, once its oldest record is LOG_FLUSH_INTERVAL_SECONDS old,
+# or as soon as a WARNING or worse arrives, so a crash loses little.
+LOG_BUFFER_CAPACITY = 50
+LOG_FLUSH_INTERVAL_SECONDS = 2.0
+LOG_FILE_BUFFER_SIZE = 64 * 1024
 NOISY_LIBRARY_LOGGERS = (
     'matplotlib',
     'PIL',
@@ -23,6 +29,13 @@ NOISY_LIBRARY_LOGGERS = (
     'pdfminer.psparser',
     'pdfplumber',
 )
+# Standard LogRecord attributes; anything else on a record came from `extra`
+_RESERVED_RECORD_KEYS = frozenset({
+    'name', 'msg', 'args', 'created', 'filename', 'funcName',
+    'levelname', 'levelno', 'lineno', 'module', 'msecs', 'message',
+    'pathname', 'process', 'processName', 'relativeCreated', 'thread',
+    'threadName', 'exc_info', 'exc_text', 'stack_info',
+})
 
 
 class StructuredFormatter(logging.Formatter):
@@ -46,10 +59,7 @@ class StructuredFormatter(logging.Formatter):
         # Extract structured data from extra fields
         structured_data = {}
         for key, value in record.__dict__.items():
-            if key not in ['name', 'msg', 'args', 'created', 'filename', 'funcName',
-                          'levelname', 'levelno', 'lineno', 'module', 'msecs', 'message',
-                          'pathname', 'process', 'processName', 'relativeCreated', 'thread',
-                          'threadName', 'exc_info', 'exc_text', 'stack_info']:
+            if key not in _RESERVED_RECORD_KEYS:
                 structured_data[key] = value
 
         # Add structured data to message if present
@@ -60,6 +70,71 @@ class StructuredFormatter(logging.Formatter):
         return base_msg
 
 
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    Rotating file handler that writes through a large buffer.
+
+    StreamHandler flushes after every record; here the stream is only flushed
+    on explicit flush() calls (batch end, shutdown) and on close.
+    """
+
+    _emitting = False
+
+    def _open(self):
+        """
+        Open the log file with LOG_FILE_BUFFER_SIZE buffering.
+
+        Returns:
+            Opened text stream
+        """
+        return open(self.baseFilename, self.mode, buffering=LOG_FILE_BUFFER_SIZE,
+                    encoding=self.encoding, errors=self.errors)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Write the record without flushing the stream.
+
+        Args:
+            record: Log record to write
+        """
+        self._emitting = True
+        try:
+            super().emit(record)
+        finally:
+            self._emitting = False
+
+    def flush(self) -> None:
+        """Flush the stream unless called from within emit()."""
+        if not self._emitting:
+            super().flush()
+
+
+class BatchingMemoryHandler(MemoryHandler):
+    """
+    Memory handler that also flushes its target's stream after each batch,
+    and does not hold a batch longer than LOG_FLUSH_INTERVAL_SECONDS.
+    """
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        """
+        Check whether the buffer should be written out after adding a record.
+
+        Args:
+            record: Record that was just buffered
+
+        Returns:
+            True if the buffer is full, the record is WARNING or worse, or the batch is stale
+        """
+        return (super().shouldFlush(record) or
+                record.created - self.buffer[0].created >= LOG_FLUSH_INTERVAL_SECONDS)
+
+    def flush(self) -> None:
+        """Hand buffered records to the target and flush it."""
+        super().flush()
+        if self.target is not None:
+            self.target.flush()
+
+
 def setup_logging(log_dir: str, log_file_name: str,
                   max_bytes_mb: Optional[int] = None,
                   backup_count: Optional[int] = None,
@@ -83,32 +158,47 @@ def setup_logging(log_dir: str, log_file_name: str,
     if backup_count is None:
         backup_count = BACKUP_COUNT
     if log_level is None:
-        # Get from settings.json or use config.py default
+        # In-memory level from config.py (no file I/O)
         log_level = get_log_level()
 
     logger = logging.getLogger()
     logger.setLevel(log_level)
 
+    # The format never shows thread/process details, so skip collecting them per record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     # Structured formatter
     formatter = StructuredFormatter(
         '%(asctime)s [%(levelname)s] %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
 
-    # Clear existing handlers to avoid duplicates
+    # Clear existing handlers to avoid duplicates (flushing any buffered records first)
     if logger.hasHandlers():
+        for handler in logger.handlers:
+            handler.flush()
         logger.handlers.clear()
 
-    # Rotating file handler
+    # Rotating file handler; the file is only opened once the first record is written
     max_bytes = max_bytes_mb * 1024 * 1024  # Convert MB to bytes
-    file_handler = RotatingFileHandler(
+    file_handler = BufferedRotatingFileHandler(
         log_file,
         maxBytes=max_bytes,
         backupCount=backup_count,
-        encoding='utf-8'
+        encoding='utf-8',
+        delay=True
     )
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+
+    # Batch records in memory; warnings, stale batches and logging.shutdown at exit flush them to disk
+    memory_handler = BatchingMemoryHandler(
+        capacity=LOG_BUFFER_CAPACITY,
+        flushLevel=logging.WARNING,
+        target=file_handler
+    )
+    logger.addHandler(memory_handler)
 
     # Console handler (non-rotating)
     console_handler = logging.StreamHandler()
@@ -1,11 +1,55 @@
 import pandas as pd
 import re
 import unicodedata
+from functools import lru_cache
 import logging
 from src.config import FILE_HEADER_KEYWORDS
 
 logger = logging.getLogger(__name__)
 
+# Control/directional marks and quote characters stripped from headers, in one pass
+_CLEAN_RE = re.compile(r'[\n\r\t\u200f\u200e"\']')
+
+# Characters stripped from amounts: thousands separators, currency signs and every
+# whitespace character regex \s matches (all str.isspace() code points are <= U+3000)
+_AMOUNT_STRIP = str.maketrans('', '', ',₪$' + ''.join(ch for ch in map(chr, range(0x3001)) if ch.isspace()))
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _clean_name(name: str) -> str:
+    """
+    Clean column names by normalizing unicode and removing directional marks.
+    Also removes various quote characters for flexible matching.
+
+    Memoized: bank and card exports repeat the same headers in every file.
+    """
+    s = unicodedata.normalize("NFKD", str(name))
+    return _CLEAN_RE.sub("", s).strip()
+
+
+def _build_alias_map(keywords: dict) -> dict[str, str]:
+    """
+    Build a lookup of cleaned alias -> target field.
+    """
+    alias_map: dict[str, str] = {}
+    for field, aliases in keywords.items():
+        if not isinstance(aliases, list):
+            continue
+        for alias in aliases:
+            key = _clean_name(alias).replace(" ", "").lower()
+            alias_map[key] = field
+    return alias_map
+
+
+@lru_cache(maxsize=1)
+def _get_alias_map() -> dict[str, str]:
+    """
+    Alias map for FILE_HEADER_KEYWORDS, built on first use and shared by every Normalizer.
+    """
+    merged_keywords = {**FILE_HEADER_KEYWORDS['mandatory'], **FILE_HEADER_KEYWORDS['optional']}
+    return _build_alias_map(merged_keywords)
+
+
 class Normalizer:
     """
     Generic, extensible normalizer for transaction DataFrames.
@@ -14,63 +58,49 @@ class Normalizer:
 
 
     def __init__(self):
-        # build cleaned alias→field map once
-        merged_keywords = {**FILE_HEADER_KEYWORDS['mandatory'], **FILE_HEADER_KEYWORDS['optional']}
-        self._alias_map = self._build_alias_map(merged_keywords)
+        # cleaned alias→field map, shared by all instances
+        self._alias_map = _get_alias_map()
         self.MANDATORY_FIELDS = FILE_HEADER_KEYWORDS['mandatory'].keys()
-
-    @staticmethod
-    def _clean_name(name: str) -> str:
-        """
-        Clean column names by normalizing unicode and removing directional marks.
-        Also removes various quote characters for flexible matching.
-        """
-        s = unicodedata.normalize("NFKD", str(name))
-        s = re.sub(r'[\n\r\t\u200f\u200e]', "", s)
-        # Remove various quote characters for flexible matching
-        s = s.replace('"', '').replace("'", '').replace('"', '').replace('"', '').replace("'", '').replace("'", '')
-        return s.strip()
-
-    def _build_alias_map(self, keywords: dict) -> dict[str, str]:
-        """
-        Build a lookup of cleaned alias -> target field.
-        """
-        alias_map: dict[str, str] = {}
-        for field, aliases in keywords.items():
-            if not isinstance(aliases, list):
-                continue
-            for alias in aliases:
-                key = self._clean_name(alias).replace(" ", "").lower()
-                alias_map[key] = field
-        return alias_map
+        self._mandatory_fields_list = list(self.MANDATORY_FIELDS)
+        self._mandatory_fields_set = frozenset(self._mandatory_fields_list)
 
     def _map_columns(self, cols: list[str]) -> dict[str, str]:
         """
-        Map raw df.columns to standard field names using alias_map,
-        ensuring each field is only assigned once.
+        Map df.columns (already passed through _clean_name by normalize)
+        to standard field names using alias_map, ensuring each field is only assigned once.
         """
         mapping: dict[str, str] = {}
         assigned_fields = set()
 
         for col in cols:
-            clean = self._clean_name(col).replace(" ", "").lower()
+            clean = col.replace(" ", "").lower()
             field = self._alias_map.get(clean)
             if field and field not in assigned_fields:
                 mapping[col] = field
                 assigned_fields.add(field)
 
-        missing = self.MANDATORY_FIELDS - assigned_fields
+        missing = set(self._mandatory_fields_set - assigned_fields)
         if missing:
             logger.warning(f"Missing expected columns: {missing}")
         return mapping
 
     @staticmethod
     def _parse_date(series: pd.Series) -> pd.Series:
-        return pd.to_datetime(series, dayfirst=True, errors='coerce')
+        # Israeli card exports use dd/mm/yyyy; parse that format directly and only
+        # send what it misses through pandas' general (inferring) parser
+        parsed = pd.to_datetime(series, format='%d/%m/%Y', errors='coerce')
+        missing = (parsed.isna() & series.notna()).to_numpy()
+        if not missing.any():
+            return parsed
+
+        values = parsed.to_numpy(dtype='datetime64[us]', copy=True)
+        fallback = pd.to_datetime(series[missing], dayfirst=True, errors='coerce')
+        values[missing] = fallback.to_numpy(dtype='datetime64[us]')
+        return pd.Series(values, index=series.index, name=series.name)
 
     @staticmethod
     def _parse_amount(series: pd.Series) -> pd.Series:
-        s = series.astype(str).str.replace(r"[,\s₪$]", "", regex=True)
+        s = series.astype(str).str.translate(_AMOUNT_STRIP)
         return pd.to_numeric(s, errors='coerce')
 
     @staticmethod
@@ -79,7 +109,7 @@ class Normalizer:
 
     def normalize(self, df: pd.DataFrame) -> pd.DataFrame:
         # 1. Clean column names
-        df = df.rename(columns=lambda c: self._clean_name(c))
+        df = df.rename(columns=_clean_name)
         logger.debug(f"Cleaned columns: {list(df.columns)}")
 
         # 2. Map to standard fields
@@ -88,7 +118,7 @@ class Normalizer:
         logger.debug(f"Mapped columns: {list(df.columns)}")
 
         # 3. Check mandatory fields
-        missing = self.MANDATORY_FIELDS - set(df.columns)
+        missing = set(self._mandatory_fields_set.difference(df.columns))
         if missing:
             logger.error(f"Missing required columns: {missing}")
 
@@ -111,33 +141,33 @@ class Normalizer:
                 f"Available columns in file: {', '.join(df.columns)}"
             )
 
-        # 4. Drop rows missing any mandatory field
-        before_drop = len(df)
-        df = df.dropna(subset=list(self.MANDATORY_FIELDS))
-        dropped = before_drop - len(df)
+        # 4./5. Parse dates and amounts, then drop every invalid row with one mask
+        mandatory_ok = df[self._mandatory_fields_list].notna().all(axis=1)
+        # Rows already failing the mandatory check are masked out so they cannot
+        # influence the inferred date format
+        parsed_date = self._parse_date(df['transaction_date'].where(mandatory_ok))
+        parsed_amount = self._parse_amount(df['amount'])
+        date_ok = parsed_date.notna()
+        amount_ok = parsed_amount.notna()
+
+        dropped = int((~mandatory_ok).sum())
         if dropped > 0:
             logger.warning(f"Dropped {dropped} rows missing mandatory fields")
-
-        # 5. Field-specific parsing
-        df['transaction_date'] = self._parse_date(df['transaction_date'])
-        before_date_drop = len(df)
-        df = df.dropna(subset=['transaction_date'])
-        dropped_date = before_date_drop - len(df)
+        dropped_date = int((mandatory_ok & ~date_ok).sum())
         if dropped_date > 0:
             logger.warning(f"Dropped {dropped_date} rows with invalid dates")
-
-        df['amount'] = self._parse_amount(df['amount'])
-        before_amount_drop = len(df)
-        df = df.dropna(subset=['amount'])
-        dropped_amount = before_amount_drop - len(df)
+        dropped_amount = int((mandatory_ok & date_ok & ~amount_ok).sum())
         if dropped_amount > 0:
             logger.warning(f"Dropped {dropped_amount} rows with invalid amounts")
 
+        df = df.assign(transaction_date=parsed_date, amount=parsed_amount)
+        df = df.loc[mandatory_ok & date_ok & amount_ok]
+
         df['merchant'] = self._parse_str(df['merchant'])
 
         # Sanitize merchant names to prevent formula injection
-        from src.validators import sanitize_merchant_name
-        df['merchant'] = df['merchant'].apply(sanitize_merchant_name)
+        from src.validators import sanitize_merchant_names
+        df['merchant'] = sanitize_merchant_names(df['merchant'])
 
         # Optional fields
         if 'purchase_amount' in df.columns:
@@ -148,9 +178,13 @@ class Normalizer:
             df['misc'] = self._parse_str(df['misc'])
 
         # 6. Derived fields
-        df['year'] = df['transaction_date'].dt.year
-        df['month'] = df['transaction_date'].dt.month
-        df['monthly_amount'] = df['amount']
+        # Year and month from one pass over the datetime64 data (months since 1970-01)
+        months_since_epoch = df['transaction_date'].to_numpy().astype('datetime64[M]').astype('int64')
+        df = df.assign(
+            year=(months_since_epoch // 12 + 1970).astype('int16'),
+            month=(months_since_epoch % 12 + 1).astype('int8'),
+            monthly_amount=df['amount'],
+        )
 
         logger.info(f"Normalization complete: {len(df)} rows")
         return df.reset_index(drop=True)
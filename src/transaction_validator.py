@@ -4,6 +4,7 @@ Transaction validation before writing to dashboard.
 import logging
 from typing import List, Tuple, Optional
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -24,12 +25,21 @@ class TransactionValidator:
         Args:
             valid_categories: Dictionary of valid categories and subcategories
         """
-        self.valid_categories = valid_categories
+        # Subcategory membership is O(1); category order is kept by the outer dict
+        self.valid_categories = {cat: frozenset(subcats) for cat, subcats in valid_categories.items()}
+        # Flat lookup sets for the vectorized category check
+        self._valid_cats = frozenset(self.valid_categories)
+        self._valid_pairs = frozenset(
+            (cat, subcat) for cat, subcats in self.valid_categories.items() for subcat in subcats
+        )
 
     def validate_summary_data(self, summary_df: pd.DataFrame) -> Tuple[bool, List[str]]:
         """
         Validate summary DataFrame before writing to dashboard.
 
+        The category/subcat columns are checked as pandas categoricals; callers may
+        pass them already as 'category' dtype to skip the conversion.
+
         Args:
             summary_df: DataFrame with transaction summary
 
@@ -50,6 +60,13 @@ class TransactionValidator:
             errors.append("Summary DataFrame is empty")
             return False, errors
 
+        # Categorical labels: strip, isin and duplicated then work on the few
+        # distinct values / integer codes instead of every row's string
+        summary_df = summary_df.assign(
+            category=summary_df['category'].astype('category'),
+            subcat=summary_df['subcat'].astype('category'),
+        )
+
         # Validate data types
         if not pd.api.types.is_numeric_dtype(summary_df['year']):
             errors.append("Year column must be numeric")
@@ -58,36 +75,53 @@ class TransactionValidator:
         if not pd.api.types.is_numeric_dtype(summary_df['monthly_amount']):
             errors.append("Monthly amount column must be numeric")
 
+        # One clock read, so year and month cannot straddle a month boundary
+        now = datetime.now()
+        current_year = now.year
+        current_month = now.month
+
+        # The numeric checks below reduce boolean arrays; no filtered frames are built
+        years = summary_df['year'].to_numpy()
+        months = summary_df['month'].to_numpy()
+
         # Validate year range
-        current_year = datetime.now().year
-        if summary_df['year'].min() < 2000 or summary_df['year'].max() > current_year + 1:
+        if years.min() < 2000 or years.max() > current_year + 1:
             errors.append(f"Year values must be between 2000 and {current_year + 1}")
 
         # Validate month range
-        invalid_months = summary_df[(summary_df['month'] < 1) | (summary_df['month'] > 12)]
-        if not invalid_months.empty:
-            errors.append(f"Invalid month values found: {invalid_months['month'].unique().tolist()}")
+        bad_months = (months < 1) | (months > 12)
+        if bad_months.any():
+            errors.append(f"Invalid month values found: {np.unique(months[bad_months]).tolist()}")
 
         # Validate amounts
-        negative_amounts = summary_df[summary_df['monthly_amount'] < 0]
-        if not negative_amounts.empty:
-            errors.append(f"Found {len(negative_amounts)} transaction(s) with negative amounts")
+        negative_count = int((summary_df['monthly_amount'].to_numpy() < 0).sum())
+        if negative_count:
+            errors.append(f"Found {negative_count} transaction(s) with negative amounts")
 
         # Validate categories exist in template
-        invalid_categories = []
-        for _, row in summary_df.iterrows():
-            cat = str(row['category']).strip()
-            subcat = str(row['subcat']).strip()
-
-            if cat not in self.valid_categories:
-                invalid_categories.append(f"Category '{cat}' not found in template")
-            elif subcat not in self.valid_categories.get(cat, []):
-                invalid_categories.append(f"Subcategory '{subcat}' not found under category '{cat}'")
-
-        if invalid_categories:
-            errors.extend(invalid_categories[:10])  # Limit to first 10
-            if len(invalid_categories) > 10:
-                errors.append(f"... and {len(invalid_categories) - 10} more category errors")
+        cats = summary_df['category'].astype(str).str.strip()
+        subcats = summary_df['subcat'].astype(str).str.strip()
+        cat_ok = cats.isin(self._valid_cats).to_numpy()
+        pair_ok = pd.MultiIndex.from_arrays([cats, subcats]).isin(self._valid_pairs)
+        bad = ~pair_ok  # an unknown category never forms a valid pair
+
+        # One message per distinct offender (an unknown category is reported once,
+        # whatever its subcategories), and only the first 10 are formatted
+        known_cat = cat_ok[bad]
+        offenders = pd.DataFrame({
+            'category': cats.to_numpy()[bad],
+            'subcat': np.where(known_cat, subcats.to_numpy()[bad], ''),
+            'known_cat': known_cat,
+        }).drop_duplicates()
+
+        if len(offenders):
+            errors.extend(
+                f"Subcategory '{subcat}' not found under category '{cat}'" if known
+                else f"Category '{cat}' not found in template"
+                for cat, subcat, known in offenders.head(10).itertuples(index=False, name=None)
+            )
+            if len(offenders) > 10:
+                errors.append(f"... and {len(offenders) - 10} more category errors")
 
         # Check for duplicate transactions (same year, month, category, subcat)
         duplicates = summary_df.duplicated(subset=['year', 'month', 'category', 'subcat'], keep=False)
@@ -96,12 +130,9 @@ class TransactionValidator:
             errors.append(f"Found {dup_count} potential duplicate transaction(s)")
 
         # Check for future dates
-        future_dates = summary_df[
-            (summary_df['year'] > current_year) |
-            ((summary_df['year'] == current_year) & (summary_df['month'] > datetime.now().month))
-        ]
-        if not future_dates.empty:
-            errors.append(f"Found {len(future_dates)} transaction(s) with future dates")
+        future_count = int(((years > current_year) | ((years == current_year) & (months > current_month))).sum())
+        if future_count:
+            errors.append(f"Found {future_count} transaction(s) with future dates")
 
         is_valid = len(errors) == 0
         return is_valid, errors
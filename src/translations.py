@@ -1,12 +1,28 @@
 """
 Bilingual translation module for Hebrew/English UI support.
 """
+import sys
+from types import MappingProxyType
+
+
+def _freeze(table: dict) -> MappingProxyType:
+    """
+    Return a read-only view of a translation table with interned keys.
+
+    Args:
+        table: Translation key -> text mapping
+
+    Returns:
+        Read-only mapping whose keys are interned strings
+    """
+    return MappingProxyType({sys.intern(key): text for key, text in table.items()})
+
 
 class Translations:
     """Manages UI text translations for Hebrew and English."""
 
-    # Hebrew translations
-    HE = {
+    # Hebrew translations (read-only)
+    HE = _freeze({
         # Window titles
         'app_title': 'מעקב תקציב',
         'category_dialog_title': 'בחר קטגוריה',
@@ -134,10 +150,10 @@ class Translations:
         'month_10': 'אוקטובר',
         'month_11': 'נובמבר',
         'month_12': 'דצמבר',
-    }
+    })
 
-    # English translations
-    EN = {
+    # English translations (read-only)
+    EN = _freeze({
         # Window titles
         'app_title': 'Budget Tracker',
         'category_dialog_title': 'Select Category',
@@ -277,7 +293,7 @@ class Translations:
         'month_10': 'October',
         'month_11': 'November',
         'month_12': 'December',
-    }
+    })
 
     def __init__(self, language: str = 'he') -> None:
         """
@@ -301,12 +317,9 @@ class Translations:
         Returns:
             Translated and formatted string
         """
-        if default is None:
-            default = key
-        text = self._translations.get(key, default)
-        if kwargs:
-            return text.format(**kwargs)
-        return text
+        text = self._translations.get(key, key if default is None else default)
+        # format_map takes the kwargs dict as-is instead of unpacking it again
+        return text.format_map(kwargs) if kwargs else text
 
     def set_language(self, language: str) -> None:
         """
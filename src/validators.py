@@ -1,10 +1,14 @@
 """
 Security and validation utilities for Budget Tracker.
 """
+import os
+import stat
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 import logging
+from functools import lru_cache
 
+import pandas as pd
 
 from src.config import (
     MAX_FILE_SIZE_MB,
@@ -15,22 +19,54 @@ from src.config import (
 
 logger = logging.getLogger(__name__)
 
+# Control characters removed by the sanitizers (everything below 0x20 except \t, \n, \r)
+_CONTROL_CHAR_TABLE = dict.fromkeys(i for i in range(32) if i not in (9, 10, 13))
+# Leading characters that make a spreadsheet treat a value as a formula
+_SUSPICIOUS_MERCHANT_STARTS = frozenset('=+-@\t\r')
+_SUSPICIOUS_CATEGORY_STARTS = frozenset('=+-@')
+_SUPPORTED_EXTENSIONS_SET = frozenset(ext.lower() for ext in SUPPORTED_EXTENSIONS)
+# validate_user_input length limits: input_type -> (max length, error label)
+_INPUT_LENGTH_LIMITS = {
+    'merchant': (MAX_MERCHANT_NAME_LENGTH, 'Merchant name'),
+    'category': (200, 'category name'),
+    'subcategory': (200, 'subcategory name'),
+}
+
+
+@lru_cache(maxsize=32)
+def _resolve_cached(path_str: str) -> Path:
+    """
+    Resolve a base directory once; the app's base directories are fixed for a run.
+
+    Args:
+        path_str: Directory path as a string
 
-def validate_path_traversal(file_path: Path, base_dir: Path) -> Tuple[bool, Optional[str]]:
+    Returns:
+        Resolved absolute path
+    """
+    return Path(path_str).resolve()
+
+
+def validate_path_traversal(file_path: Path, base_dir: Path,
+                            already_resolved: bool = False) -> Tuple[bool, Optional[str]]:
     """
     Validate that file path is within base directory (prevents path traversal attacks).
 
     Args:
         file_path: Absolute path to validate
         base_dir: Base directory that file must be within
+        already_resolved: True if both paths were already resolved by the caller
 
     Returns:
         Tuple of (is_valid, error_message)
     """
     try:
         # Ensure both paths are absolute and normalized
-        abs_path = file_path.resolve()
-        abs_base = base_dir.resolve()
+        if already_resolved:
+            abs_path, abs_base = file_path, base_dir
+        else:
+            abs_path = file_path.resolve()
+            abs_base = base_dir.resolve()
 
         # Check if the resolved path is within the base directory
         try:
@@ -50,13 +86,47 @@ class ValidationError(Exception):
     pass
 
 
-def validate_file_path(file_path: Path, base_dir: Path = TRANSACTIONS_DIR) -> Path:
+def _find_symlink(file_path: Path, base_dir: Path) -> Optional[Path]:
+    """
+    Find a symbolic link in file_path itself or in any directory between base_dir and it.
+
+    Uses lstat on the raw, unnormalized components, so a link is seen before resolve()
+    follows it and before a later '..' would hide it.
+
+    Args:
+        file_path: Path to inspect, as given by the caller
+        base_dir: Absolute, normalized base directory the path should be within
+
+    Returns:
+        The first symlinked component found, or None
+    """
+    # Path() drops '.' but keeps '..', unlike os.path.abspath
+    raw_path = Path(os.getcwd(), file_path)
+    base_parts = base_dir.parts
+    if raw_path.parts[:len(base_parts)] == base_parts:
+        # Every prefix below the base, in order; links above the base are allowed
+        candidates = [Path(*raw_path.parts[:i]) for i in range(len(base_parts) + 1, len(raw_path.parts) + 1)]
+    else:
+        candidates = [raw_path]
+
+    for candidate in candidates:
+        try:
+            if stat.S_ISLNK(os.lstat(candidate).st_mode):
+                return candidate
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return None
+
+
+def validate_file_path(file_path: Path, base_dir: Path = TRANSACTIONS_DIR,
+                       allow_symlinks: bool = False) -> Path:
     """
     Validate that file path is safe and within allowed directory.
 
     Args:
         file_path: Path to validate
         base_dir: Base directory that file must be within
+        allow_symlinks: Accept paths that go through symbolic links
 
     Returns:
         Resolved absolute path
@@ -65,12 +135,25 @@ def validate_file_path(file_path: Path, base_dir: Path = TRANSACTIONS_DIR) -> Pa
         ValidationError: If path is unsafe
     """
     try:
-        # Resolve to absolute path
+        lex_base = Path(os.path.abspath(base_dir))
+        # Resolve the base directory only once per run
+        abs_base = _resolve_cached(str(lex_base))
+
+        # Reject symlinks before resolve() replaces them with their targets
+        if not allow_symlinks:
+            link = _find_symlink(file_path, lex_base)
+            if link is not None:
+                raise ValidationError(
+                    f"Security Error: '{link}' is a symbolic link.\n"
+                    f"Please select the original file instead of a link to it."
+                )
+
+        # Containment is always checked on the fully resolved path: a lexical
+        # normalization would collapse '..' before any link is followed
         abs_path = file_path.resolve()
-        abs_base = base_dir.resolve()
 
         # Use enhanced traversal validation
-        is_valid, error_msg = validate_path_traversal(abs_path, abs_base)
+        is_valid, error_msg = validate_path_traversal(abs_path, abs_base, already_resolved=True)
         if not is_valid:
             raise ValidationError(
                 f"Security Error: {error_msg}\n"
@@ -90,13 +173,15 @@ def validate_file_path(file_path: Path, base_dir: Path = TRANSACTIONS_DIR) -> Pa
         )
 
 
-def validate_file_size(file_path: Path, max_size_mb: int = MAX_FILE_SIZE_MB) -> bool:
+def validate_file_size(file_path: Path, max_size_mb: int = MAX_FILE_SIZE_MB,
+                       stat_result: Optional[os.stat_result] = None) -> bool:
     """
     Validate file size is within limits.
 
     Args:
         file_path: Path to file
         max_size_mb: Maximum size in megabytes
+        stat_result: Optional result of a stat call the caller already made
 
     Returns:
         True if valid
@@ -104,16 +189,20 @@ def validate_file_size(file_path: Path, max_size_mb: int = MAX_FILE_SIZE_MB) ->
     Raises:
         ValidationError: If file too large
     """
-    if not file_path.exists():
-        raise ValidationError(
-            f"File Not Found: '{file_path}' does not exist.\n"
-            f"Please verify the file exists and try again."
-        )
+    if stat_result is None:
+        try:
+            stat_result = os.stat(file_path)
+        except (FileNotFoundError, NotADirectoryError):
+            raise ValidationError(
+                f"File Not Found: '{file_path}' does not exist.\n"
+                f"Please verify the file exists and try again."
+            )
 
-    size_bytes = file_path.stat().st_size
+    size_bytes = stat_result.st_size
     size_mb = size_bytes / (1024 * 1024)
 
-    if size_mb > max_size_mb:
+    # Compare exact byte counts rather than rounded megabytes
+    if size_bytes > max_size_mb * 1024 * 1024:
         raise ValidationError(
             f"File Too Large: '{file_path.name}' exceeds the size limit.\n"
             f"File size: {size_mb:.1f}MB\n"
@@ -121,7 +210,7 @@ def validate_file_size(file_path: Path, max_size_mb: int = MAX_FILE_SIZE_MB) ->
             f"Please use a smaller file or contact support if this limit should be increased."
         )
 
-    logger.debug(f"File {file_path.name} size: {size_mb:.2f}MB - OK")
+    logger.debug("File %s size: %.2fMB - OK", file_path.name, size_mb)
     return True
 
 
@@ -141,10 +230,13 @@ def validate_file_extension(file_path: Path, allowed_extensions: list = None) ->
     """
     if allowed_extensions is None:
         allowed_extensions = SUPPORTED_EXTENSIONS
+        extension_set = _SUPPORTED_EXTENSIONS_SET
+    else:
+        extension_set = frozenset(ext.lower() for ext in allowed_extensions)
 
     extension = file_path.suffix.lower()
 
-    if extension not in allowed_extensions:
+    if extension not in extension_set:
         raise ValidationError(
             f"Unsupported File Type: '{extension}' files are not supported.\n"
             f"Supported file types: {', '.join(allowed_extensions)}\n"
@@ -170,21 +262,65 @@ def sanitize_merchant_name(name: str) -> str:
     # Convert to string and strip
     name = str(name).strip()
 
+    # Plain ASCII letters/digits have no control characters or formula prefix
+    if name.isascii() and name.isalnum() and len(name) <= MAX_MERCHANT_NAME_LENGTH:
+        return name
+
     # Remove null bytes and control characters
-    name = ''.join(char for char in name if ord(char) >= 32 or char in '\n\r\t')
+    name = name.translate(_CONTROL_CHAR_TABLE)
 
     # Truncate to max length
     name = name[:MAX_MERCHANT_NAME_LENGTH]
 
     # Prefix with single quote if starts with suspicious characters
-    suspicious_starts = ['=', '+', '-', '@', '\t', '\r']
-    if any(name.startswith(char) for char in suspicious_starts):
+    if name and name[0] in _SUSPICIOUS_MERCHANT_STARTS:
         name = "'" + name
         logger.warning(f"Potentially dangerous merchant name sanitized: {name[:50]}")
 
     return name
 
 
+def sanitize_merchant_names(names: pd.Series) -> pd.Series:
+    """
+    Vectorized sanitize_merchant_name for a whole column of merchant names.
+
+    Each distinct name is sanitized once and mapped back to its rows, since
+    statements repeat the same merchants many times. Missing values (None/NaN)
+    and empty strings become "".
+
+    Args:
+        names: Series of raw merchant names
+
+    Returns:
+        Series of sanitized names with the same index
+    """
+    codes, uniques = pd.factorize(names, use_na_sentinel=False)
+    unique_names = pd.Series(uniques)
+    cleaned = unique_names.astype(str)
+
+    if cleaned.str.contains("\x00", regex=False).any():
+        # pandas hashes strings only up to a NUL byte, so factorize may have merged
+        # distinct names; such malformed input is sanitized row by row instead
+        return pd.Series(
+            ["" if pd.isna(name) else sanitize_merchant_name(name) for name in names],
+            index=names.index, name=names.name,
+        )
+
+    empty = unique_names.isna() | (unique_names == "")
+    cleaned = cleaned.str.strip()
+    cleaned = cleaned.str.translate(_CONTROL_CHAR_TABLE)
+    cleaned = cleaned.str.slice(0, MAX_MERCHANT_NAME_LENGTH)
+
+    suspicious = cleaned.str[:1].isin(list(_SUSPICIOUS_MERCHANT_STARTS)) & ~empty
+    if suspicious.any():
+        cleaned[suspicious] = "'" + cleaned[suspicious]
+        for name in cleaned[suspicious]:
+            logger.warning(f"Potentially dangerous merchant name sanitized: {name[:50]}")
+
+    cleaned[empty] = ""
+    return pd.Series(cleaned.to_numpy()[codes], index=names.index, name=names.name)
+
+
 def sanitize_category_name(name: str) -> str:
     """
     Sanitize category or subcategory name to prevent injection attacks.
@@ -201,12 +337,15 @@ def sanitize_category_name(name: str) -> str:
     # Convert to string and strip
     name = str(name).strip()
 
+    # Plain ASCII letters/digits have no control characters or formula prefix
+    if name.isascii() and name.isalnum() and len(name) <= 200:
+        return name
+
     # Remove null bytes and control characters (except newlines/tabs)
-    name = ''.join(char for char in name if ord(char) >= 32 or char in '\n\r\t')
+    name = name.translate(_CONTROL_CHAR_TABLE)
 
     # Remove Excel formula injection patterns
-    dangerous_patterns = ['=', '+', '-', '@']
-    if any(name.startswith(pattern) for pattern in dangerous_patterns):
+    if name and name[0] in _SUSPICIOUS_CATEGORY_STARTS:
         name = "'" + name
         logger.warning(f"Potentially dangerous category name sanitized: {name[:50]}")
 
@@ -239,16 +378,11 @@ def validate_user_input(input_str: str, input_type: str) -> tuple[bool, Optional
     if '\x00' in input_str:
         return False, f"{input_type} contains invalid characters"
 
-    # Type-specific validation
-    if input_type == 'merchant':
-        if len(input_str) > MAX_MERCHANT_NAME_LENGTH:
-            return False, f"Merchant name too long (max {MAX_MERCHANT_NAME_LENGTH} characters)"
-    elif input_type in ('category', 'subcategory'):
-        if len(input_str) > 200:
-            return False, f"{input_type} name too long (max 200 characters)"
-    elif input_type == 'path':
-        # Path validation is handled by validate_file_path
-        pass
+    # Type-specific length limit (path validation is handled by validate_file_path)
+    limit = _INPUT_LENGTH_LIMITS.get(input_type)
+    if limit is not None and len(input_str) > limit[0]:
+        max_length, label = limit
+        return False, f"{label} too long (max {max_length} characters)"
 
     return True, None
 
@@ -267,9 +401,14 @@ def validate_transaction_file(file_path: Path) -> bool:
         ValidationError: If any validation fails
     """
     validate_file_extension(file_path)
-    validate_file_size(file_path)
+    # One stat answers both the size and the regular-file checks
+    try:
+        st = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
+        st = None
+    validate_file_size(file_path, stat_result=st)
     # Additional check: ensure it's a real file
-    if not file_path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         raise ValidationError(
             f"Invalid File: '{file_path}' is not a valid file.\n"
             f"It may be a directory or a special system item.\n"
@@ -279,6 +418,39 @@ def validate_transaction_file(file_path: Path) -> bool:
     return True
 
 
+def validate_transaction_files_in_dir(dir_path: Path, max_size_mb: int = MAX_FILE_SIZE_MB) -> List[Path]:
+    """
+    Validate every supported transaction file in a directory with a single scan.
+
+    os.scandir reports each entry's type with the listing, so a file costs at most one stat.
+    Symbolic links, non-regular entries and oversized files are skipped with a warning.
+
+    Args:
+        dir_path: Directory to scan
+        max_size_mb: Maximum size in megabytes
+
+    Returns:
+        Paths of the valid files, in directory order
+    """
+    valid_files = []
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if os.path.splitext(entry.name)[1].lower() not in _SUPPORTED_EXTENSIONS_SET:
+                continue
+            file_path = Path(entry.path)
+            if not entry.is_file(follow_symlinks=False):
+                logger.warning(f"Skipping {entry.name}: not a regular file")
+                continue
+            try:
+                validate_file_size(file_path, max_size_mb, stat_result=entry.stat(follow_symlinks=False))
+            except ValidationError as e:
+                logger.warning(f"Skipping {entry.name}: {e}")
+                continue
+            valid_files.append(file_path)
+
+    return valid_files
+
+
 def validate_excel_file(file_path: Path) -> bool:
     """Backward-compatible wrapper for transaction file validation."""
     return validate_transaction_file(file_path)
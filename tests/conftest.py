@@ -46,8 +46,8 @@ def sample_normalized_df():
     })
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def translations():
-    """Provide translations object for GUI tests."""
+    """Provide translations object for GUI tests (shared; tests must not switch its language)."""
     from src.translations import Translations
     return Translations('en')
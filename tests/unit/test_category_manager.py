@@ -15,16 +15,12 @@ def create_dashboard_with_template(file_path):
     ws.title = "Template"
 
     # Add headers
-    ws['A1'] = 'Category'
-    ws['B1'] = 'Subcategory'
+    ws.append(['Category', 'Subcategory'])
 
     # Add some sample data to make template valid
-    ws['A2'] = 'Shopping'
-    ws['B2'] = 'Online'
-    ws['A3'] = ''
-    ws['B3'] = 'Retail'
-    ws['A4'] = 'Food'
-    ws['B4'] = 'Groceries'
+    ws.append(['Shopping', 'Online'])
+    ws.append(['', 'Retail'])
+    ws.append(['Food', 'Groceries'])
 
     wb.save(file_path)
 
@@ -108,13 +104,29 @@ def test_category_manager_maps_known_merchants(temp_dir, sample_categories):
     create_dashboard_with_template(dashboard_file)
 
     df = pd.DataFrame({
-        'merchant': ['Amazon', 'Supermarket'],
-        'amount': [100.0, 50.0]
-    })
+        'merchant': ['Amazon', 'Supermarket', 'Unknown Shop', 'Amazon'],
+        'amount': [100.0, 50.0, 20.0, 30.0]
+    }, index=[10, 11, 12, 13])
 
     manager = CategoryManager(categories_file, dashboard_file)
-    df['category'] = df['merchant'].map(lambda m: manager.category_map.get(m, [None, None])[0])
-    df['subcat'] = df['merchant'].map(lambda m: manager.category_map.get(m, [None, None])[1])
+    df['category'], df['subcat'] = manager.lookup_mappings(df['merchant'])
 
-    assert df['category'].tolist() == ['Shopping', 'Food']
-    assert df['subcat'].tolist() == ['Online', 'Groceries']
+    assert df['category'].tolist()[:2] == ['Shopping', 'Food']
+    assert df['subcat'].tolist()[:2] == ['Online', 'Groceries']
+    assert df.loc[13, 'category'] == 'Shopping'
+    assert pd.isna(df.loc[12, 'category']) and pd.isna(df.loc[12, 'subcat'])
+
+
+def test_category_manager_flat_choices_follow_valid_categories(temp_dir):
+    """Test that flat_choices is rebuilt when valid_categories is replaced."""
+    categories_file = temp_dir / 'categories.json'
+    categories_file.write_text('{}', encoding='utf-8')
+
+    dashboard_file = temp_dir / 'dashboard.xlsx'
+    create_dashboard_with_template(dashboard_file)
+
+    manager = CategoryManager(categories_file, dashboard_file)
+    assert manager.flat_choices == (('Shopping', 'Online'), ('Shopping', 'Retail'), ('Food', 'Groceries'))
+
+    manager.valid_categories = {'Travel': ['Flights']}
+    assert manager.flat_choices == (('Travel', 'Flights'),)
@@ -87,9 +87,8 @@ def test_dashboard_writer_gets_category_ranges(temp_dir):
     # Create a simple workbook
     wb = Workbook()
     ws = wb.active
-    ws['A2'] = 'Food'
-    ws['A3'] = 'Food'
-    ws['A4'] = 'Shopping'
+    for row in ([None], ['Food'], ['Food'], ['Shopping']):
+        ws.append(row)
 
     dashboard_path = temp_dir / 'test_dashboard.xlsx'
     wb.save(dashboard_path)
@@ -131,6 +130,22 @@ def test_dashboard_writer_adds_new_category_before_summary_row(temp_dir):
     assert "A5:B5" in {str(rng) for rng in ws.merged_cells.ranges}
 
 
+def test_dashboard_writer_appends_new_category_without_summary_row():
+    """Without a summary row, new categories go on a fresh row at the bottom."""
+    wb = Workbook()
+    ws = wb.active
+    ws["A1"] = "Category"
+    ws["A2"] = "Food"
+    ws["B2"] = "Groceries"
+
+    writer = DashboardWriter(Path("dummy.xlsx"))
+
+    assert writer._add_new_category(ws, "Shopping") == 3
+    assert ws["A3"].value == "Shopping"
+    assert ws["B3"].value is None
+    assert writer._get_category_row_ranges(ws)["Shopping"] == (3, 3)
+
+
 def test_dashboard_writer_adds_new_subcategory_before_summary_row(temp_dir):
     """New subcategories should shift the summary row instead of writing into merged cells."""
     wb = _build_dashboard_with_summary()
@@ -181,6 +196,13 @@ def test_dashboard_writer_update_adds_new_category_before_summary_row(temp_dir,
     assert ws["C5"].value == 123.45
     wb.close()
 
+    # The background backup holds the pre-update workbook
+    backups = list(backup_dir.iterdir())
+    assert len(backups) == 1
+    backup_wb = load_workbook(backups[0])
+    assert "2024" not in backup_wb.sheetnames
+    backup_wb.close()
+
 
 def test_dashboard_writer_update_adds_new_subcategory_before_summary_row(temp_dir, monkeypatch):
     """Public update() should shift merged summary rows when inserting subcategories."""
@@ -254,3 +276,62 @@ def test_dashboard_writer_unmerges_legacy_month_cells_before_write(temp_dir, mon
     wb_after.close()
 
 
+
+
+def test_dashboard_writer_add_subcategory_keeps_maps_in_sync(temp_dir):
+    """Inserting a subcategory should shift later rows in the maps like a full rescan would."""
+    wb = _build_dashboard_with_summary()
+    writer = DashboardWriter(temp_dir / 'test_dashboard.xlsx')
+    ws = wb["2024"]
+    ranges = writer._get_category_row_ranges(ws)
+    subcat_map = writer._build_subcat_location_map(ws, ranges)
+
+    writer._add_new_subcategory(ws, "Food", "Dining", subcat_map, ranges)
+
+    assert ranges == writer._get_category_row_ranges(ws)
+    assert subcat_map == writer._build_subcat_location_map(ws, ranges)
+    assert subcat_map[("Bank", "Fees")] == 4
+
+
+def test_dashboard_writer_update_clones_template_for_each_new_year(temp_dir, monkeypatch):
+    """Year sheets cloned in one update should each get an independent copy of the template."""
+    from openpyxl.styles import Font
+
+    backup_dir = temp_dir / "dash_backups"
+    backup_dir.mkdir()
+    monkeypatch.setattr("src.dashboard_writer.DASHBOARD_BACKUP_DIR", backup_dir)
+
+    wb = _build_template_dashboard_with_summary()
+    template = wb["Template"]
+    template["C2"].font = Font(bold=True)
+    template["C3"].font = Font(bold=True)
+    template.column_dimensions["B"].width = 30
+    dashboard_path = temp_dir / "dashboard.xlsx"
+    wb.save(dashboard_path)
+
+    summary_df = pd.DataFrame({
+        "year": [2024, 2025],
+        "month": [1, 1],
+        "category": ["Food", "Bank"],
+        "subcat": ["Groceries", "Fees"],
+        "monthly_amount": [10.0, 20.0],
+    })
+
+    writer = DashboardWriter(dashboard_path)
+    writer.update(summary_df, conflict_resolver=lambda _: "override")
+
+    wb = load_workbook(dashboard_path)
+    ws_2024, ws_2025 = wb["2024"], wb["2025"]
+
+    for ws in (ws_2024, ws_2025):
+        assert ws["A4"].value == "Summary"
+        assert "A4:B4" in {str(rng) for rng in ws.merged_cells.ranges}
+        assert ws.column_dimensions["B"].width == 30
+
+    assert ws_2024["C2"].value == 10.0
+    assert ws_2025["C3"].value == 20.0
+    # Writing a cell restyles it on its own sheet only
+    assert ws_2024["C2"].font.bold is False
+    assert ws_2025["C2"].font.bold is True
+    assert ws_2024["C3"].font.bold is True
+    wb.close()
@@ -1,7 +1,6 @@
 """Tests for SHA256-based duplicate file detection."""
 import pytest
 import shutil
-import tempfile
 from pathlib import Path
 import pandas as pd
 from gui_app import calculate_file_hash
@@ -14,6 +14,7 @@ def test_load_transaction_files_empty_directory(temp_dir):
     result = load_transaction_files(temp_dir)
 
     assert result == []
+    assert load_transaction_files(temp_dir / 'missing') == []
 
 
 def test_ensure_dirs_creates_directories(temp_dir):
@@ -59,6 +60,47 @@ def test_load_transaction_file_excel_with_header_detection(tmp_path):
     assert set(result["source_file"]) == {"transactions.xlsx"}
 
 
+def test_load_transaction_file_excel_matches_header_row_read(tmp_path):
+    """Single-read header slicing should match read_excel(header=...) column names and dtypes."""
+    file_path = tmp_path / "transactions.xlsx"
+
+    raw_df = pd.DataFrame([
+        ["Statement period", None, None, None, None],
+        ["תאריך", "שם בית העסק", "סכום", "סכום", None],
+        ["01/01/2025", "Supermarket", 100, "1,000", None],
+        [None, None, None, None, None],
+        ["02/01/2025", "Coffee Shop", 24.90, "3", "note"],
+    ])
+    raw_df.to_excel(file_path, index=False, header=False)
+
+    result = file_manager._load_transaction_file(file_path)
+    expected = pd.read_excel(file_path, header=1, engine="openpyxl")
+    expected["source_file"] = "transactions.xlsx"
+
+    assert list(result.columns) == ["תאריך", "שם בית העסק", "סכום", "סכום.1", "Unnamed: 4", "source_file"]
+    pd.testing.assert_frame_equal(result, expected)
+
+
+
+def test_load_transaction_file_excel_header_collisions_and_dtypes_match_pandas(tmp_path):
+    """Suffix collisions, numeric headers and all-blank columns should match read_excel(header=...)."""
+    file_path = tmp_path / "transactions.xlsx"
+
+    raw_df = pd.DataFrame([
+        ["תאריך", "שם בית העסק", "סכום חיוב", "סכום חיוב", None, "סכום חיוב.1", 2025, None],
+        ["01/01/2025", "Supermarket", 100, 1, None, 7, 1.5, None],
+        ["02/01/2025", "Coffee Shop", 24.90, 2, None, 8, 2, None],
+    ])
+    raw_df.to_excel(file_path, index=False, header=False)
+
+    result = file_manager._load_transaction_file(file_path)
+    expected = pd.read_excel(file_path, header=0, engine="openpyxl")
+    expected["source_file"] = "transactions.xlsx"
+
+    assert list(result.columns[2:6]) == ["סכום חיוב", "סכום חיוב.2", "Unnamed: 4", "סכום חיוב.1"]
+    assert [type(name) for name in result.columns] == [type(name) for name in expected.columns]
+    pd.testing.assert_frame_equal(result, expected)
+
 def test_load_transaction_file_pdf_from_extracted_rows(monkeypatch, tmp_path):
     """Test loading a statement-style PDF transaction file from extracted lines."""
     file_path = tmp_path / "transactions.pdf"
@@ -1,18 +1,7 @@
 """
 Tests for GUI dialog components.
 """
-import pytest
 from gui_app import CategoryDialog, ConflictDialog
-from src.translations import Translations
-
-
-
-
-
-@pytest.fixture
-def translations():
-    """Create translations object."""
-    return Translations('en')
 
 
 class TestCategoryDialog:
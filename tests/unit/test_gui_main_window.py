@@ -16,33 +16,31 @@ from pathlib import Path
 @pytest.fixture
 def gui_window(qapp, tmp_path, monkeypatch):
     """Create GUI window with temporary directories."""
-    transactions_dir = tmp_path / 'transactions'
-    archive_dir = tmp_path / 'archive'
-    dashboard_path = tmp_path / 'dashboard.xlsx'
-    appdata_dir = tmp_path / 'appdata'
-    categories_path = tmp_path / 'categories.json'
-
-    # Patch config paths to use temp directory
-    monkeypatch.setattr('src.config.TRANSACTIONS_DIR', transactions_dir)
-    monkeypatch.setattr('src.config.DASHBOARD_FILE_PATH', dashboard_path)
-    monkeypatch.setattr('src.config.APPDATA_DIR', appdata_dir)
-    monkeypatch.setattr('src.config.ARCHIVE_DIR', archive_dir)
-    monkeypatch.setattr('src.config.CATEGORIES_FILE_PATH', categories_path)
-
-    # Patch already-imported module globals used by the GUI
-    monkeypatch.setattr(gui_module, 'TRANSACTIONS_DIR', transactions_dir)
-    monkeypatch.setattr(gui_module, 'DASHBOARD_FILE_PATH', dashboard_path)
-    monkeypatch.setattr(gui_module, 'APPDATA_DIR', appdata_dir)
-    monkeypatch.setattr(gui_module, 'ARCHIVE_DIR', archive_dir)
-    monkeypatch.setattr(gui_module, 'CATEGORIES_FILE_PATH', categories_path)
+    overrides = {
+        'TRANSACTIONS_DIR': tmp_path / 'transactions',
+        'DASHBOARD_FILE_PATH': tmp_path / 'dashboard.xlsx',
+        'APPDATA_DIR': tmp_path / 'appdata',
+        'ARCHIVE_DIR': tmp_path / 'archive',
+        'CATEGORIES_FILE_PATH': tmp_path / 'categories.json',
+    }
+
+    # Patch config paths to use temp directory, including the
+    # already-imported module globals used by the GUI
+    for name, value in overrides.items():
+        monkeypatch.setattr(f'src.config.{name}', value)
+        monkeypatch.setattr(gui_module, name, value)
 
     # Create directories
-    transactions_dir.mkdir()
+    overrides['TRANSACTIONS_DIR'].mkdir()
     (tmp_path / 'output').mkdir()
-    archive_dir.mkdir()
+    overrides['ARCHIVE_DIR'].mkdir()
 
     window = BudgetTrackerGUI('en')
-    return window
+    yield window
+
+    # Detach the window's log handler and free it; qapp is shared by the whole session
+    window.close()
+    window.deleteLater()
 
 
 class TestBudgetTrackerGUI:
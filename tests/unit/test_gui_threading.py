@@ -3,21 +3,25 @@ Tests for GUI threading components.
 """
 import pytest
 import pandas as pd
+from openpyxl import Workbook
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QTimer
 from gui_app import ProcessThread
-from src.translations import Translations
 from src.config import TRANSACTIONS_DIR
 from pathlib import Path
 
 
-
-
-
-@pytest.fixture
-def translations():
-    """Create translations object."""
-    return Translations('en')
+@pytest.fixture(scope='module')
+def dashboard_file(tmp_path_factory):
+    """Template-only dashboard shared by the mapping tests, which only read it."""
+    dashboard_file = tmp_path_factory.mktemp('dashboard') / 'dashboard.xlsx'
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'Template'
+    ws.append(['Category', 'Subcategory'])
+    ws.append(['Food', 'Groceries'])
+    wb.save(dashboard_file)
+    return dashboard_file
 
 
 class TestProcessThread:
@@ -46,27 +50,13 @@ class TestProcessThread:
         assert thread.timeout_timer is not None
         assert thread.timeout_timer.isSingleShot() is True
 
-    def test_map_categories_gui_no_unknown(self, qapp, translations, tmp_path):
+    def test_map_categories_gui_no_unknown(self, qapp, translations, dashboard_file, tmp_path):
         """Test category mapping with no unknown merchants."""
         from src.category_manager import CategoryManager
-        from openpyxl import Workbook
-
-        # Create test dashboard
-        dashboard_file = tmp_path / 'dashboard.xlsx'
-        wb = Workbook()
-        ws = wb.active
-        ws.title = 'Template'
-        ws['A1'] = 'Category'
-        ws['B1'] = 'Subcategory'
-        ws['A2'] = 'Food'
-        ws['B2'] = 'Groceries'
-        wb.save(dashboard_file)
 
         # Create categories file
         categories_file = tmp_path / 'categories.json'
-        import json
-        with open(categories_file, 'w') as f:
-            json.dump({'Merchant1': ['Food', 'Groceries']}, f)
+        categories_file.write_text('{"Merchant1": ["Food", "Groceries"]}', encoding='utf-8')
 
         thread = ProcessThread(translations)
         cat_mgr = CategoryManager(categories_file, dashboard_file)
@@ -83,25 +73,13 @@ class TestProcessThread:
         assert result_df['category'].iloc[0] == 'Food'
         assert result_df['subcat'].iloc[0] == 'Groceries'
 
-    def test_map_categories_gui_prompts_once_for_default_mapped_merchant(self, qapp, translations, tmp_path, monkeypatch):
+    def test_map_categories_gui_prompts_once_for_default_mapped_merchant(
+            self, qapp, translations, dashboard_file, tmp_path, monkeypatch):
         """Default mapping should prompt once, then persist and stop prompting."""
         from src.category_manager import CategoryManager
-        from openpyxl import Workbook
-
-        dashboard_file = tmp_path / 'dashboard.xlsx'
-        wb = Workbook()
-        ws = wb.active
-        ws.title = 'Template'
-        ws['A1'] = 'Category'
-        ws['B1'] = 'Subcategory'
-        ws['A2'] = 'Food'
-        ws['B2'] = 'Groceries'
-        wb.save(dashboard_file)
 
         categories_file = tmp_path / 'categories.json'
-        import json
-        with open(categories_file, 'w') as f:
-            json.dump({}, f)
+        categories_file.write_text('{}', encoding='utf-8')
 
         df = pd.DataFrame({
             'merchant': ['Merchant1'],
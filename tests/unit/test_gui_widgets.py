@@ -1,20 +1,9 @@
 """
 Tests for GUI widget components.
 """
-import pytest
 import pandas as pd
 from PyQt5.QtCore import QMimeData, QUrl
 from gui_app import ChartWidget, FileListWidget, LogViewerWidget
-from src.translations import Translations
-
-
-
-
-
-@pytest.fixture
-def translations():
-    """Create translations object."""
-    return Translations('en')
 
 
 class TestLogViewerWidget:
@@ -31,9 +20,9 @@ class TestLogViewerWidget:
             ("WARNING", "Warning message"),
         ]:
             log_widget.add_log(level, message)
-            html_content = log_widget.log_text.toHtml()
-            assert message in html_content
-            assert f"[{level}]" in html_content
+            text = log_widget.log_text.toPlainText()
+            assert message in text
+            assert f"[{level}]" in text
 
         log_widget.clear_logs()
         assert log_widget.log_text.toPlainText() == ""
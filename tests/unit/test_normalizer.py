@@ -66,3 +66,21 @@ def test_normalizer_sorts_by_date():
     assert len(result) == 3
     assert 'year' in result.columns
     assert 'month' in result.columns
+
+
+def test_normalizer_parses_mixed_date_formats():
+    """dd/mm/yyyy strings, Excel datetimes and other formats should all parse day-first."""
+    from datetime import datetime
+
+    normalizer = Normalizer()
+    df = pd.DataFrame({
+        'transaction_date': ['05/02/2024', datetime(2024, 3, 7), '1.4.2024', 'not a date'],
+        'merchant': ['A', 'B', 'C', 'D'],
+        'amount': ['1,200', '₪ 30', '45.5', '10'],
+    })
+
+    result = normalizer.normalize(df)
+
+    assert result['merchant'].tolist() == ['A', 'B', 'C']
+    assert result['transaction_date'].dt.strftime('%Y-%m-%d').tolist() == ['2024-02-05', '2024-03-07', '2024-04-01']
+    assert result['amount'].tolist() == [1200.0, 30.0, 45.5]
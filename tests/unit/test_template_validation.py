@@ -12,14 +12,11 @@ from src.category_manager import (
 
 
 def _create_test_dashboard(path: Path, data):
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Template"
-    ws["A1"] = "נושא הוצאה"
-    ws["B1"] = "פירוט הוצאות"
-    for i, (cat, subcat) in enumerate(data, start=2):
-        ws[f"A{i}"] = cat
-        ws[f"B{i}"] = subcat
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Template")
+    ws.append(["נושא הוצאה", "פירוט הוצאות"])
+    for cat, subcat in data:
+        ws.append([cat, subcat])
     wb.save(path)
 
 
@@ -33,6 +30,7 @@ def test_template_helper_functions_and_validation_result():
         (None, None),
         ("   ", None),
         ("#REF!", None),
+        ("#Hashtag", "#Hashtag"),
         ("  Test  ", "Test"),
     ]
     for raw, expected in safe_cases:
@@ -168,3 +166,24 @@ def test_template_validation_scenarios(tmp_path):
                 scenario["warning_contains"].lower() in warn.lower()
                 for warn in validation.warnings
             ), scenario["name"]
+
+
+def test_template_validation_stops_at_category_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.category_manager.MAX_CATEGORIES", 2)
+    categories_path = tmp_path / "categories.json"
+    categories_path.write_text("{}")
+    dashboard_path = tmp_path / "dashboard.xlsx"
+    _create_test_dashboard(
+        dashboard_path,
+        [("א", "1"), ("", "2"), ("ב", "1"), ("", "2"), ("ג", "1"), ("", "2"), ("ג", "1")],
+    )
+
+    manager = CategoryManager(categories_path, dashboard_path, strict_validation=False)
+    validation = manager.validate_template_structure()
+
+    assert validation.is_valid is False
+    assert any("Too many categories" in err for err in validation.errors)
+    # Rows after the limit are not scanned, so the duplicate is never reported
+    assert not any("Duplicate category" in err for err in validation.errors)
+    # The category that tripped the limit is not reported as lacking subcategories
+    assert validation.warnings == []
@@ -1,14 +1,30 @@
+import os
+import random
+import sys
+
+import pandas as pd
 import pytest
 
 from src.validators import (
     MAX_MERCHANT_NAME_LENGTH,
     ValidationError,
     sanitize_merchant_name,
+    sanitize_merchant_names,
     validate_excel_file,
     validate_file_extension,
     validate_file_path,
     validate_file_size,
+    validate_transaction_files_in_dir,
 )
+from src.config import MAX_FILE_SIZE_BYTES
+
+# Creating symlinks needs extra privileges on Windows
+requires_symlinks = pytest.mark.skipif(sys.platform == "win32", reason="symlink creation needs privileges on Windows")
+
+
+def _fake_stat(size_bytes):
+    """Build a stat result for a regular file of the given size, without touching the disk."""
+    return os.stat_result((0o100644, 0, 0, 1, 0, 0, size_bytes, 0, 0, 0))
 
 
 def test_file_path_size_and_extension_validations(tmp_path):
@@ -21,13 +37,14 @@ def test_file_path_size_and_extension_validations(tmp_path):
         validate_file_path(unsafe_path, base_dir=tmp_path)
 
     small = tmp_path / "small.xlsx"
-    small.write_bytes(b"0" * 1024)
-    assert validate_file_size(small) is True
+    assert validate_file_size(small, stat_result=_fake_stat(1024)) is True
+    assert validate_file_size(small, stat_result=_fake_stat(MAX_FILE_SIZE_BYTES)) is True
+    with pytest.raises(ValidationError, match="File Too Large"):
+        validate_file_size(small, stat_result=_fake_stat(MAX_FILE_SIZE_BYTES + 1))
 
     large = tmp_path / "large.xlsx"
-    large.write_bytes(b"0" * 1024 * 1024 * 2)
     with pytest.raises(ValidationError, match="File Too Large"):
-        validate_file_size(large, max_size_mb=1)
+        validate_file_size(large, max_size_mb=1, stat_result=_fake_stat(1024 * 1024 * 2))
 
     missing = tmp_path / "missing.xlsx"
     with pytest.raises(ValidationError, match="File Not Found"):
@@ -39,6 +56,88 @@ def test_file_path_size_and_extension_validations(tmp_path):
         validate_file_extension(tmp_path / "bad.exe", allowed_extensions=[".xlsx"])
 
 
+def test_validate_file_extension_does_no_io(monkeypatch, tmp_path):
+    def _no_stat(*args, **kwargs):
+        raise AssertionError("validate_file_extension must not touch the filesystem")
+
+    monkeypatch.setattr(os, "stat", _no_stat)
+    monkeypatch.setattr(os, "lstat", _no_stat)
+
+    assert validate_file_extension(tmp_path / "missing" / "report.XLSX") is True
+    with pytest.raises(ValidationError, match="Unsupported File Type"):
+        validate_file_extension(tmp_path / "missing" / "report.csv")
+
+
+@requires_symlinks
+def test_validate_file_path_rejects_symlinks(tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    target = outside / "data.xlsx"
+    target.touch()
+    base = tmp_path / "transactions"
+    base.mkdir()
+
+    (base / "link.xlsx").symlink_to(target)
+    (base / "linked_dir").symlink_to(outside, target_is_directory=True)
+    (base / "inside.xlsx").touch()
+    (base / "inside_link.xlsx").symlink_to(base / "inside.xlsx")
+    (base / "dangling.xlsx").symlink_to(outside / "missing.xlsx")
+
+    with pytest.raises(ValidationError, match="Security Error: .* is a symbolic link"):
+        validate_file_path(base / "link.xlsx", base_dir=base)
+    # lstat sees the link itself, even when its target does not exist
+    with pytest.raises(ValidationError, match="symbolic link"):
+        validate_file_path(base / "dangling.xlsx", base_dir=base)
+    # A '..' after a linked directory must not hide the link
+    (outside / "secret.xlsx").touch()
+    with pytest.raises(ValidationError, match="symbolic link"):
+        validate_file_path(base / "linked_dir" / ".." / "secret.xlsx", base_dir=base)
+    with pytest.raises(ValidationError, match="symbolic link"):
+        validate_file_path(base / "linked_dir" / "data.xlsx", base_dir=base)
+    with pytest.raises(ValidationError, match="symbolic link"):
+        validate_file_path(base / "inside_link.xlsx", base_dir=base)
+
+    # Opting in still keeps the containment check on the resolved target
+    resolved = validate_file_path(base / "inside_link.xlsx", base_dir=base, allow_symlinks=True)
+    assert resolved == (base / "inside.xlsx").resolve()
+    with pytest.raises(ValidationError, match="Security Error"):
+        validate_file_path(base / "link.xlsx", base_dir=base, allow_symlinks=True)
+
+
+@requires_symlinks
+def test_validate_file_path_checks_containment_on_resolved_path(tmp_path, monkeypatch):
+    outside = tmp_path / "outside"
+    (outside / "a").mkdir(parents=True)
+    (outside / "secret.xlsx").touch()
+    base = tmp_path / "transactions"
+    base.mkdir()
+    (base / "link").symlink_to(outside / "a", target_is_directory=True)
+
+    # Even if the symlink check is bypassed, '..' after a link must be resolved on disk
+    monkeypatch.setattr("src.validators._find_symlink", lambda *args: None)
+    with pytest.raises(ValidationError, match="Path traversal detected"):
+        validate_file_path(base / "link" / ".." / "secret.xlsx", base_dir=base)
+
+    (base / "sub").mkdir()
+    assert validate_file_path(base / "sub" / ".." / "ok.xlsx", base_dir=base) == (base / "ok.xlsx").resolve()
+
+
+@requires_symlinks
+def test_validate_transaction_files_in_dir_skips_invalid_entries(tmp_path):
+    (tmp_path / "good.xlsx").write_bytes(b"0" * 1024)
+    (tmp_path / "GOOD2.PDF").write_bytes(b"0" * 1024)
+    (tmp_path / "notes.txt").write_bytes(b"0" * 1024)
+    # Sparse file: reports 2 MB without writing any data
+    (tmp_path / "large.xls").touch()
+    os.truncate(tmp_path / "large.xls", 1024 * 1024 * 2)
+    (tmp_path / "folder.xlsx").mkdir()
+    (tmp_path / "link.xlsx").symlink_to(tmp_path / "good.xlsx")
+
+    valid = validate_transaction_files_in_dir(tmp_path, max_size_mb=1)
+
+    assert sorted(p.name for p in valid) == ["GOOD2.PDF", "good.xlsx"]
+
+
 def test_sanitize_merchant_name_and_validate_excel_file(tmp_path):
     normal_cases = [
         ("Supermarket", "Supermarket"),
@@ -54,18 +153,55 @@ def test_sanitize_merchant_name_and_validate_excel_file(tmp_path):
         ("+Dangerous", "'+Dangerous"),
         ("-Negative", "'-Negative"),
         ("@Twitter", "'@Twitter"),
+        # Leading tab/CR are stripped first, so the formula behind them is still caught
+        ("\t=cmd", "'=cmd"),
+        ("\r@foo", "'@foo"),
+        ("\x01=HYPERLINK()", "'=HYPERLINK()"),
     ]
     for raw, expected in injection_cases:
-        assert sanitize_merchant_name(raw) == expected
+        assert sanitize_merchant_name(raw) == expected, repr(raw)
 
-    long_name = "A" * 300
-    assert len(sanitize_merchant_name(long_name)) == MAX_MERCHANT_NAME_LENGTH
+    for length in (MAX_MERCHANT_NAME_LENGTH - 1, MAX_MERCHANT_NAME_LENGTH, MAX_MERCHANT_NAME_LENGTH + 1, 10_000):
+        assert len(sanitize_merchant_name("A" * length)) == min(length, MAX_MERCHANT_NAME_LENGTH)
+        # Multi-word names skip the ASCII fast path and are sliced the same way
+        assert sanitize_merchant_name("A " * length) == ("A " * length).strip()[:MAX_MERCHANT_NAME_LENGTH]
 
     valid_file = tmp_path / "valid.xlsx"
-    valid_file.write_bytes(b"fake excel content")
+    valid_file.touch()
     assert validate_excel_file(valid_file) is True
 
     not_file = tmp_path / "directory.xlsx"
     not_file.mkdir()
     with pytest.raises(ValidationError, match="Invalid File"):
         validate_excel_file(not_file)
+
+
+def test_sanitize_merchant_names_matches_scalar_sanitizer():
+    raw = ["Supermarket", " Cafe Aroma ", "", "=SUM(A1:B2)", "@Twitter",
+           "-Negative", "\x01\tTabbed", "Bad\x00Byte", "A" * 300, "ביג  "]
+    expected = [sanitize_merchant_name(name) for name in raw]
+
+    result = sanitize_merchant_names(pd.Series(raw, index=range(10, 20)))
+
+    assert result.tolist() == expected
+    assert list(result.index) == list(range(10, 20))
+
+    # Names that differ only after a NUL byte must not be merged
+    nul_names = pd.Series(["Shop\x00A", "Shop\x00B", "Shop\x00A", None])
+    assert sanitize_merchant_names(nul_names).tolist() == ["ShopA", "ShopB", "ShopA", ""]
+
+
+def test_sanitize_merchant_name_invariants_on_random_input():
+    # Fixed seed: a broad but reproducible sweep over risky characters
+    rng = random.Random(0)
+    alphabet = "=+-@'\t\r\n \x00\x01\x1fAz9ש₪"
+    raw = ["".join(rng.choices(alphabet, k=rng.randint(0, 2 * MAX_MERCHANT_NAME_LENGTH))) for _ in range(500)]
+
+    for name in raw:
+        out = sanitize_merchant_name(name)
+        assert not any(ch in out for ch in "\x00\x01\x1f"), repr(name)
+        # A quote prefix is added after trimming, so it may take one extra character
+        assert len(out) <= MAX_MERCHANT_NAME_LENGTH + 1, repr(name)
+        assert not (out and out[0] in "=+-@\t\r"), repr(name)
+
+    assert sanitize_merchant_names(pd.Series(raw)).tolist() == [sanitize_merchant_name(n) for n in raw]